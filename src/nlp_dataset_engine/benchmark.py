@@ -9,9 +9,10 @@ class BenchmarkRunner:
     """
     Measures the raw throughput (rows/sec and bytes/sec) of the engine.
     """
-    def __init__(self, input_path: str, text_col: str = "text"):
+    def __init__(self, input_path: str, text_col: str = "text", backend: str = "stdlib"):
         self.input_path = input_path
         self.text_col = text_col
+        self.backend = backend
         self.validator = DataValidator(min_length=1) # Minimal validation for speed test
 
     def run(self) -> Dict[str, Any]:
@@ -23,7 +24,7 @@ class BenchmarkRunner:
         total_bytes = 0
         
         # We process but DO NOT write to disk, to measure pure engine speed
-        streamer = DatasetStreamer(self.input_path, text_column=self.text_col)
+        streamer = DatasetStreamer(self.input_path, text_column=self.text_col, backend=self.backend)
         
         for row in streamer.stream():
             # Validate to simulate real work
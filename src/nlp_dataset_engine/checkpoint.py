@@ -1,22 +1,30 @@
 import os
-from typing import Set
+from typing import Optional
+from .memory import SpillableSet
 
 class CheckpointManager:
     """
     Tracks which files have been successfully processed to allow resuming.
+    The text file is the source of truth; the in-memory index of processed
+    paths spills to disk past `max_items` (or when the memory budget asks).
     """
-    def __init__(self, checkpoint_file: str):
+    def __init__(self, checkpoint_file: str, max_items: Optional[int] = None):
         self.checkpoint_file = checkpoint_file
-        self.processed_files: Set[str] = self._load()
+        self.max_items = max_items
+        self.processed_files: SpillableSet = self._load()
 
-    def _load(self) -> Set[str]:
+    def _load(self) -> SpillableSet:
         """Loads the list of processed file paths from disk."""
+        processed = SpillableSet(max_items=self.max_items)
         if not os.path.exists(self.checkpoint_file):
-            return set()
+            return processed
         
         with open(self.checkpoint_file, "r", encoding="utf-8") as f:
             # We use absolute paths to be safe
-            return set(line.strip() for line in f if line.strip())
+            for line in f:
+                if line.strip():
+                    processed.add(line.strip())
+        return processed
 
     def is_done(self, file_path: str) -> bool:
         """Checks if a file has already been processed."""
@@ -28,4 +36,10 @@ class CheckpointManager:
         if abs_path not in self.processed_files:
             self.processed_files.add(abs_path)
             with open(self.checkpoint_file, "a", encoding="utf-8") as f:
-                f.write(abs_path + "\n")
\ No newline at end of file
+                f.write(abs_path + "\n")
+
+    def memory_usage(self) -> int:
+        return self.processed_files.memory_usage()
+
+    def spill(self):
+        self.processed_files.spill()
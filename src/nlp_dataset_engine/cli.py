@@ -1,17 +1,20 @@
 import argparse
 import sys
 import os
-import random
-from .streamer import DatasetStreamer
-from .validators import DataValidator
-from .stats import DatasetStats
-from .crawler import FileCrawler
-from .sharder import ShardedWriter
-from .checkpoint import CheckpointManager
-from .manifest import ManifestGenerator
-from .benchmark import BenchmarkRunner  # <--- NEW IMPORT
+from .streamer import CSV_BACKENDS
+
+# Subsystems are imported inside the commands that use them, so short-lived
+# jobs (and `--help`) only pay for what they run.
 
 def ingest_command(args):
+    from .validators import DataValidator
+    from .dataset import Dataset
+    from .crawler import FileCrawler
+    from .sharder import ShardedWriter
+    from .checkpoint import CheckpointManager
+    from .manifest import ManifestGenerator
+    from .memory import MemoryMonitor, parse_size
+
     print(f"🚀 Starting Engine (Integrity Mode)...")
     print(f"   Input:      {args.input}")
     
@@ -22,12 +25,8 @@ def ingest_command(args):
     if args.compress:
         print("   Compression: GZIP Enabled 📦")
     
-    # 0. Deterministic Seed
-    random.seed(42)
-    
     # 1. Initialize Components
     crawler = FileCrawler()
-    stats = DatasetStats()
     validator = DataValidator(
         min_length=10, 
         check_english=args.english, 
@@ -47,70 +46,86 @@ def ingest_command(args):
         os.remove(ckpt_path)
         checkpoint = CheckpointManager(ckpt_path)
     
-    # 2. Find files
-    files = list(crawler.find_files(args.input))
-    print(f"   Found {len(files)} file(s).")
-    
-    if not files:
+    # 2. Find files (crawled lazily: only check that there is at least one)
+    if next(crawler.find_files(args.input), None) is None:
         print("❌ No files found.")
         sys.exit(1)
 
-    # 3. Processing Loop
-    print("\n⏳ Processing...", end="", flush=True)
-    stop_processing = False
+    # Memory budget: components spill or back off when RSS exceeds it
+    max_bytes = parse_size(args.max_memory) if args.max_memory else None
+    monitor = MemoryMonitor(max_bytes, trace=args.trace_memory)
+    if max_bytes:
+        print(f"   Memory:     budget {args.max_memory}")
+
+    # 3. Build the plan (same lazy engine as the Dataset API)
+    dataset = Dataset.from_path(
+        args.input,
+        text_column=args.col,
+        csv_backend=args.csv_backend,
+        keep_original_row=args.original_row,
+        on_error="warn",
+        profile=args.profile
+    )
+    if args.sample < 1.0:
+        dataset = dataset.sample(args.sample, seed=42)  # Deterministic seed
+    dataset = dataset.validate(validator)
+    if args.limit > 0:
+        dataset = dataset.limit(args.limit)
+
+    # Optional: tokenize valid rows into packed training sequences
+    writers = [writer]
+    packer = None
+    if args.tokenize:
+        from .packer import PackedSequenceWriter
+        packer = PackedSequenceWriter(
+            output_prefix,
+            tokenizer=args.tokenize,
+            seq_len=args.seq_len,
+            workers=args.token_workers
+        )
+        writers.append(packer)
 
+    # 4. Processing Loop
+    print("\n⏳ Processing...", end="", flush=True)
     try:
-        for file_path in files:
-            if stop_processing: break
-            
-            if args.resume and checkpoint.is_done(file_path):
-                print(f"\n⏩ Skipping (already done): {os.path.basename(file_path)}")
-                continue
-            
-            try:
-                streamer = DatasetStreamer(file_path, text_column=args.col)
-                for row in streamer.stream():
-                    
-                    if args.sample < 1.0 and random.random() > args.sample:
-                        continue 
-
-                    is_valid = validator.validate(row)
-                    stats.update(is_valid)
-                    
-                    if is_valid:
-                        writer.write_item(row)
-                        
-                        if args.limit > 0 and stats.valid_count >= args.limit:
-                            print(f"\n🛑 Limit of {args.limit} rows reached.")
-                            stop_processing = True
-                            break
-                
-                if not stop_processing:
-                    checkpoint.mark_done(file_path)
-                        
-            except Exception as e:
-                print(f"\n⚠️  Error reading {file_path}: {e}")
-                continue
-                
+        stats = dataset.write(*writers, checkpoint=checkpoint, monitor=monitor)
     finally:
-        writer.close()
+        for w in writers:
+            w.close()
 
-    # 4. Generate Manifest (The Integrity Layer)
+    # 5. Generate Manifest (The Integrity Layer)
     if stats.valid_count > 0:
         manifest_gen = ManifestGenerator(output_prefix)
-        manifest_gen.generate(stats.valid_count)
+        manifest_gen.generate(stats.valid_count, token_index=packer.index_path if packer else None)
+        if stats.profile is not None:
+            stats.profile.save(manifest_gen.output_dir)
 
-    # 5. Final Report
+    # 6. Final Report
     report = stats.get_report()
     print(f"\n\n📊 SESSION REPORT")
     print(f"--------------------------")
+    print(f"📁 Files:         {report['files_processed']}")
     print(f"✅ Valid Rows:    {report['valid_rows']}")
     print(f"📂 Shards Created: {writer.current_shard_index + 1}")
+    if packer:
+        print(f"🧩 Token Sequences: {sum(s['num_sequences'] for s in packer.shards)} x {args.seq_len}")
+    memory = monitor.get_report()
+    budget = f" / {memory['budget_mb']} MB budget" if memory["budget_mb"] else ""
+    if memory["peak_mb"] is None:
+        print(f"🧠 Peak Memory:   unavailable (install psutil, or use --trace-memory){budget}")
+    else:
+        print(f"🧠 Peak Memory:   {memory['peak_mb']} MB ({memory['source']}){budget}")
+    for name, peak_mb in memory["component_peak_mb"].items():
+        print(f"     {name}: {peak_mb} MB")
+    if memory["spill_events"]:
+        print(f"     spills: {memory['spill_events']}")
     print(f"--------------------------")
 
 def benchmark_command(args):
     """Runs the speed test."""
-    runner = BenchmarkRunner(args.input, text_col=args.col)
+    from .benchmark import BenchmarkRunner
+
+    runner = BenchmarkRunner(args.input, text_col=args.col, backend=args.csv_backend)
     results = runner.run()
     
     print(f"\n\n🚀 BENCHMARK RESULTS")
@@ -122,27 +137,107 @@ def benchmark_command(args):
     
     runner.save_report(results)
 
+def coordinate_command(args):
+    """Plans work units and writes the queue config for distributed workers."""
+    from .distributed import WorkQueue, plan_units
+    from .memory import parse_size
+
+    queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+    queue.write_config({
+        "output": os.path.abspath(args.output.replace(".jsonl", "")),
+        "col": args.col,
+        "english": args.english,
+        "shard_size": args.shard_size,
+        "sample": args.sample,
+        "compress": args.compress,
+        "profile": args.profile,
+        "csv_backend": args.csv_backend,
+        "original_row": args.original_row,
+        "lease_seconds": args.lease_seconds
+    })
+
+    split_bytes = parse_size(args.split_bytes) if args.split_bytes else None
+    added = queue.enqueue(plan_units(args.input, split_bytes=split_bytes))
+    status = queue.status()
+    print(f"🗂️  Queued {added} new work unit(s) in {args.queue}")
+    print(f"   Pending: {status['pending']}  Leased: {status['leased']}  Done: {status['done']}")
+
+def worker_command(args):
+    """Leases and processes work units until the queue is drained."""
+    from .distributed import WorkQueue, DistributedWorker
+
+    worker = DistributedWorker(WorkQueue(args.queue), worker_id=args.worker_id, poll_seconds=args.poll_seconds)
+    print(f"👷 Worker {worker.worker_id} started on {args.queue}")
+    completed = worker.run()
+    print(f"\n✅ Worker {worker.worker_id} finished: {completed} unit(s) completed")
+
+def reduce_command(args):
+    """Merges worker stats and builds a single manifest."""
+    from .distributed import WorkQueue, reduce_queue
+
+    try:
+        stats = reduce_queue(WorkQueue(args.queue))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    report = stats.get_report()
+    print(f"\n\n📊 DISTRIBUTED REPORT")
+    print(f"--------------------------")
+    print(f"📁 Files:         {report['files_processed']}")
+    print(f"✅ Valid Rows:    {report['valid_rows']}")
+    print(f"🗑️  Dropped Rows:  {report['dropped_rows']} ({report['drop_rate_percent']}%)")
+    print(f"--------------------------")
+
+def _add_pipeline_args(parser):
+    """Options shared by single-node ingest and the distributed coordinator."""
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--col", default="text")
+    parser.add_argument("--english", action="store_true", default=True)
+    parser.add_argument("--no-english", action="store_false", dest="english")
+    parser.add_argument("--shard-size", type=int, default=10000)
+    parser.add_argument("--sample", type=float, default=1.0)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--csv-backend", choices=sorted(CSV_BACKENDS), default="stdlib")
+    parser.add_argument("--no-original-row", action="store_false", dest="original_row")
+
 def main():
     parser = argparse.ArgumentParser()
     subparsers = parser.add_subparsers(dest="command")
 
     # --- INGEST COMMAND ---
     ingest_parser = subparsers.add_parser("ingest")
-    ingest_parser.add_argument("--input", required=True)
-    ingest_parser.add_argument("--output", required=True)
-    ingest_parser.add_argument("--col", default="text")
-    ingest_parser.add_argument("--english", action="store_true", default=True)
-    ingest_parser.add_argument("--no-english", action="store_false", dest="english")
-    ingest_parser.add_argument("--shard-size", type=int, default=10000)
+    _add_pipeline_args(ingest_parser)
     ingest_parser.add_argument("--limit", type=int, default=0)
-    ingest_parser.add_argument("--sample", type=float, default=1.0)
     ingest_parser.add_argument("--resume", action="store_true")
-    ingest_parser.add_argument("--compress", action="store_true")
+    ingest_parser.add_argument("--tokenize", default=None, help="byte, whitespace or a tokenizer.json path")
+    ingest_parser.add_argument("--seq-len", type=int, default=2048)
+    ingest_parser.add_argument("--token-workers", type=int, default=os.cpu_count() or 1)
+    ingest_parser.add_argument("--max-memory", default=None, help="Soft memory budget, e.g. 512M or 2G")
+    ingest_parser.add_argument("--trace-memory", action="store_true", help="Account Python heap via tracemalloc instead of RSS")
 
     # --- BENCHMARK COMMAND (NEW) ---
     bench_parser = subparsers.add_parser("benchmark")
     bench_parser.add_argument("--input", required=True)
     bench_parser.add_argument("--col", default="text")
+    bench_parser.add_argument("--csv-backend", choices=sorted(CSV_BACKENDS), default="stdlib")
+
+    # --- DISTRIBUTED COMMANDS (shared-filesystem work queue) ---
+    coord_parser = subparsers.add_parser("coordinate")
+    _add_pipeline_args(coord_parser)
+    coord_parser.add_argument("--queue", required=True)
+    coord_parser.add_argument("--split-bytes", default=None, help="Split text files into byte ranges, e.g. 256M")
+    coord_parser.add_argument("--lease-seconds", type=float, default=300)
+
+    worker_parser = subparsers.add_parser("worker")
+    worker_parser.add_argument("--queue", required=True)
+    worker_parser.add_argument("--worker-id", default=None)
+    worker_parser.add_argument("--poll-seconds", type=float, default=5.0)
+
+    reduce_parser = subparsers.add_parser("reduce")
+    reduce_parser.add_argument("--queue", required=True)
 
     args = parser.parse_args()
 
@@ -150,6 +245,12 @@ def main():
         ingest_command(args)
     elif args.command == "benchmark":
         benchmark_command(args)
+    elif args.command == "coordinate":
+        coordinate_command(args)
+    elif args.command == "worker":
+        worker_command(args)
+    elif args.command == "reduce":
+        reduce_command(args)
     else:
         parser.print_help()
 
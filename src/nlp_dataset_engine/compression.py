@@ -1,5 +1,3 @@
-import gzip
-import io
 from typing import IO
 
 def smart_open(filename: str, mode: str = "r") -> IO:
@@ -14,6 +12,7 @@ def smart_open(filename: str, mode: str = "r") -> IO:
         encoding = None
 
     if filename.endswith(".gz"):
+        import gzip  # Codecs are only loaded when a compressed file is used
         # gzip.open handles compression transparently
         return gzip.open(filename, mode + "t", encoding=encoding) # 't' for text mode
     else:
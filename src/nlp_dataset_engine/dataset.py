@@ -0,0 +1,345 @@
+import hashlib
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from .crawler import FileCrawler
+from .streamer import DatasetStreamer, TextStreamer, Row, Batch
+from .stats import DatasetStats
+from .validators import DataValidator
+from .sharder import ShardedWriter
+from .jsonl_writer import JSONLWriter
+from .checkpoint import CheckpointManager
+from .memory import MemoryMonitor, SpillableSet
+
+RowFn = Callable[[Row], Optional[Row]]
+# A file path, or a work unit {'path', 'start', 'end'} covering a byte range of a text file
+Source = Union[str, Dict[str, Any]]
+
+
+class _Run:
+    """Mutable state for a single execution of a plan."""
+    def __init__(self, profile: bool, monitor: Optional[MemoryMonitor] = None):
+        self.stats = DatasetStats(profile=profile)
+        self.source: Optional[str] = None
+        self.exhausted = False
+        self.failed = False  # The current file hit an error (on_error='warn')
+        self.limit: Optional[int] = None
+        self.monitor = monitor
+
+    def register(self, name: str, component):
+        """Exposes a stateful component to the memory budget, if there is one."""
+        if self.monitor is not None:
+            self.monitor.register(name, component)
+
+
+class _Stage:
+    """
+    One lazy step of a plan. bind() is called once per run and returns a
+    per-row function; returning None drops the row.
+    """
+    def bind(self, run: _Run) -> RowFn:
+        raise NotImplementedError
+
+
+class _Map(_Stage):
+    def __init__(self, fn: Callable[[Row], Row]):
+        self.fn = fn
+
+    def bind(self, run):
+        return self.fn
+
+
+class _Filter(_Stage):
+    def __init__(self, predicate: Callable[[Row], bool]):
+        self.predicate = predicate
+
+    def bind(self, run):
+        predicate = self.predicate
+        return lambda row: row if predicate(row) else None
+
+
+class _Validate(_Stage):
+    def __init__(self, validator: DataValidator):
+        self.validator = validator
+
+    def bind(self, run):
+        validate = self.validator.validate
+        stats = run.stats
+
+        def step(row):
+            is_valid = validate(row)
+            stats.update(is_valid, row, source=run.source)
+            return row if is_valid else None
+        return step
+
+
+class _Sample(_Stage):
+    def __init__(self, rate: float, seed: int):
+        self.rate = rate
+        self.seed = seed
+
+    def bind(self, run):
+        import random
+        draw = random.Random(self.seed).random
+        rate = self.rate
+        return lambda row: None if draw() > rate else row
+
+
+class _Dedup(_Stage):
+    def __init__(self, key: str):
+        self.key = key
+
+    def bind(self, run):
+        # Spills to disk when the memory budget is exceeded
+        seen = SpillableSet()
+        run.register("dedup", seen)
+        key = self.key
+
+        def step(row):
+            # 8-byte digests instead of full texts keep the seen-set compact
+            digest = hashlib.blake2b(row[key].encode("utf-8"), digest_size=8).digest()
+            if digest in seen:
+                return None
+            seen.add(digest)
+            return row
+        return step
+
+
+class _Limit(_Stage):
+    def __init__(self, n: int):
+        self.n = n
+
+    def bind(self, run):
+        state = {"count": 0}
+        n = run.limit = self.n
+
+        def step(row):
+            if state["count"] >= n:
+                run.exhausted = True
+                return None
+            state["count"] += 1
+            if state["count"] >= n:
+                # Nothing downstream can pass any more, stop reading now
+                run.exhausted = True
+            return row
+        return step
+
+
+def _fuse(fns: List[RowFn]) -> RowFn:
+    """Fuses a chain of per-row steps into one function, so no step materializes rows."""
+    if not fns:
+        return lambda row: row
+    if len(fns) == 1:
+        return fns[0]
+
+    def pipeline(row):
+        for fn in fns:
+            row = fn(row)
+            if row is None:
+                return None
+        return row
+    return pipeline
+
+
+class Dataset:
+    """
+    A lazy, composable view over a set of input files.
+
+    Transformations (filter, map, validate, sample, dedup, limit) only extend
+    the plan. Nothing is read until the dataset is iterated or written; then
+    files are streamed in batches and all steps run as one fused pass per row.
+
+        stats = (Dataset.from_path("./raw")
+                 .validate(DataValidator(check_english=False))
+                 .dedup()
+                 .write_shards("./clean/data", shard_size=10000))
+    """
+
+    def __init__(self, files: Callable[[], Iterable[Source]], text_column: str = "text",
+                 csv_backend: str = "stdlib", keep_original_row: bool = True,
+                 batch_size: int = 1024, on_error: str = "raise", profile: bool = False,
+                 file_format: str = "auto", keep_blank_lines: bool = False,
+                 stages: Optional[List[_Stage]] = None):
+        if on_error not in ("raise", "warn"):
+            raise ValueError("on_error must be 'raise' or 'warn'")
+        if file_format not in ("auto", "csv", "text"):
+            raise ValueError("file_format must be 'auto', 'csv' or 'text'")
+        self._files = files
+        self.text_column = text_column
+        self.csv_backend = csv_backend
+        self.keep_original_row = keep_original_row
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.profile = profile
+        # 'auto' picks the parser by extension (.csv or line-oriented text)
+        self.file_format = file_format
+        self.keep_blank_lines = keep_blank_lines
+        self._stages: List[_Stage] = list(stages or [])
+        self.stats: Optional[DatasetStats] = None
+
+    # --- Sources ---
+
+    @classmethod
+    def from_path(cls, path: str, extensions: Optional[List[str]] = None, **options) -> "Dataset":
+        """All supported files under `path` (recursive), crawled lazily on each run."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Path not found: {path}")
+        crawler = FileCrawler(extensions)
+        return cls(lambda: crawler.find_files(path), **options)
+
+    @classmethod
+    def from_files(cls, files: Iterable[Source], **options) -> "Dataset":
+        """
+        An explicit list of inputs: file paths, or work units
+        {'path': ..., 'start': ..., 'end': ...} that read only the lines
+        beginning inside [start, end) of a text file.
+        """
+        files = list(files)
+        return cls(lambda: files, **options)
+
+    # --- Plan building ---
+
+    def _with(self, stage: _Stage) -> "Dataset":
+        return Dataset(
+            self._files, text_column=self.text_column, csv_backend=self.csv_backend,
+            keep_original_row=self.keep_original_row, batch_size=self.batch_size,
+            on_error=self.on_error, profile=self.profile, file_format=self.file_format,
+            keep_blank_lines=self.keep_blank_lines, stages=self._stages + [stage]
+        )
+
+    def filter(self, predicate: Callable[[Row], bool]) -> "Dataset":
+        return self._with(_Filter(predicate))
+
+    def map(self, fn: Callable[[Row], Row]) -> "Dataset":
+        """Applies fn to every row. Returning None from fn drops the row."""
+        return self._with(_Map(fn))
+
+    def validate(self, validator: Optional[DataValidator] = None) -> "Dataset":
+        """Filters with a DataValidator and records valid/dropped counts in `stats`."""
+        return self._with(_Validate(validator or DataValidator()))
+
+    def sample(self, rate: float, seed: int = 42) -> "Dataset":
+        """Keeps each row with probability `rate` (deterministic for a given seed)."""
+        return self._with(_Sample(rate, seed))
+
+    def dedup(self, key: str = "text") -> "Dataset":
+        """Drops rows whose `key` field was already seen (exact match)."""
+        return self._with(_Dedup(key))
+
+    def limit(self, n: int) -> "Dataset":
+        """Stops reading once n rows have passed this point."""
+        return self._with(_Limit(n))
+
+    # --- Execution ---
+
+    def _open(self, file_path: str, start: int = 0, end: Optional[int] = None):
+        is_csv = file_path.lower().endswith(".csv") if self.file_format == "auto" else self.file_format == "csv"
+        if is_csv:
+            if start or end is not None:
+                raise ValueError("Byte ranges are only supported for line-oriented text files")
+            return DatasetStreamer(
+                file_path, text_column=self.text_column, backend=self.csv_backend,
+                keep_original_row=self.keep_original_row, batch_size=self.batch_size
+            )
+        return TextStreamer(file_path, batch_size=self.batch_size, start=start, end=end,
+                            skip_blank=not self.keep_blank_lines)
+
+    def _run_file(self, run: _Run, pipeline: RowFn, file_path: str,
+                  start: int, end: Optional[int]) -> Iterator[Batch]:
+        """Yields the surviving rows of each input batch (possibly empty). Read errors follow on_error."""
+        try:
+            for batch in self._open(file_path, start, end).stream_batches():
+                if run.exhausted:
+                    break
+                out = []
+                for row in batch:
+                    row = pipeline(row)
+                    if row is not None:
+                        out.append(row)
+                    if run.exhausted:
+                        break
+                yield out
+        except Exception as e:
+            if self.on_error == "raise":
+                raise
+            print(f"\n⚠️  Error reading {file_path}: {e}")
+            run.failed = True
+
+    def _execute(self, checkpoint: Optional[CheckpointManager] = None,
+                 monitor: Optional[MemoryMonitor] = None,
+                 progress: Optional[Callable[[], None]] = None) -> Iterator[Batch]:
+        run = _Run(self.profile, monitor)
+        self.stats = run.stats
+        run.register("checkpoint", checkpoint)
+        run.register("profile", run.stats.profile)
+        pipeline = _fuse([stage.bind(run) for stage in self._stages])
+
+        for entry in self._files():
+            # Entries are paths, or work units {'path', 'start', 'end'} (byte ranges)
+            if isinstance(entry, dict):
+                file_path, start, end = entry["path"], entry.get("start", 0), entry.get("end")
+            else:
+                file_path, start, end = entry, 0, None
+
+            if checkpoint is not None and checkpoint.is_done(file_path):
+                print(f"\n⏩ Skipping (already done): {os.path.basename(file_path)}")
+                continue
+
+            run.source = file_path
+            run.failed = False
+            for out in self._run_file(run, pipeline, file_path, start, end):
+                if out:
+                    yield out
+                # Outside the per-file error handling: a budget or liveness
+                # failure (e.g. a lost lease) must stop the run, not skip a file
+                if monitor is not None:
+                    monitor.check()
+                if progress is not None:
+                    progress()
+            if run.failed:
+                continue
+
+            if run.exhausted:
+                print(f"\n🛑 Limit of {run.limit} rows reached.")
+                return
+
+            # The consumer has handled every batch of this file by now
+            run.stats.files_processed += 1
+            if checkpoint is not None:
+                checkpoint.mark_done(file_path)
+
+    def iter_batches(self) -> Iterator[Batch]:
+        return self._execute()
+
+    def __iter__(self) -> Iterator[Row]:
+        for batch in self._execute():
+            yield from batch
+
+    def write(self, *writers, checkpoint: Optional[CheckpointManager] = None,
+              monitor: Optional[MemoryMonitor] = None,
+              progress: Optional[Callable[[], None]] = None) -> DatasetStats:
+        """
+        Runs the plan into one or more writers (anything with write_batch()).
+        Writers are not closed here. Returns the run's DatasetStats.
+        With a MemoryMonitor, memory is checked after every batch and stateful
+        components (dedup, checkpoint, writers) spill or back off when over budget.
+        `progress` is called after every input batch, even one whose rows were all dropped.
+        """
+        if monitor is not None:
+            for writer in writers:
+                monitor.register(type(writer).__name__, writer)
+        for batch in self._execute(checkpoint, monitor, progress):
+            for writer in writers:
+                writer.write_batch(batch)
+        return self.stats
+
+    def write_shards(self, output_prefix: str, shard_size: int = 10000, compress: bool = False,
+                     checkpoint: Optional[CheckpointManager] = None) -> DatasetStats:
+        writer = ShardedWriter(output_prefix, shard_size=shard_size, compress=compress)
+        try:
+            return self.write(writer, checkpoint=checkpoint)
+        finally:
+            writer.close()
+
+    def write_jsonl(self, output_path: str) -> DatasetStats:
+        JSONLWriter(output_path).write_batches(self._execute())
+        return self.stats
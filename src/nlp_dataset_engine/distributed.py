@@ -0,0 +1,349 @@
+import hashlib
+import json
+import os
+import re
+import socket
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .crawler import FileCrawler
+from .dataset import Dataset
+from .stats import DatasetStats
+from .validators import DataValidator
+from .sharder import ShardedWriter
+from .manifest import ManifestGenerator
+
+class LeaseLost(RuntimeError):
+    """The lease expired and the work unit was handed to another worker."""
+
+
+def plan_units(input_path: str, split_bytes: Optional[int] = None,
+               extensions: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields work units for every file under `input_path`.
+    Text files larger than `split_bytes` become several byte ranges; CSV
+    files are always whole units (quoted fields may span lines).
+    """
+    for path in FileCrawler(extensions).find_files(input_path):
+        path = os.path.abspath(path)
+        size = os.path.getsize(path)
+        if split_bytes and size > split_bytes and not path.lower().endswith(".csv"):
+            for start in range(0, size, split_bytes):
+                yield {"path": path, "start": start, "end": min(start + split_bytes, size)}
+        else:
+            yield {"path": path}
+
+def unit_id(unit: Dict[str, Any]) -> str:
+    """Stable id for a unit, so re-running the coordinator never enqueues twice."""
+    key = f"{unit['path']}:{unit.get('start', 0)}:{unit.get('end')}"
+    return "unit-" + hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+def _write_json_atomic(path: str, data: Dict[str, Any]):
+    # Hidden temp name: never matched as a unit while it is being written
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{name}.{socket.gethostname()}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class Lease:
+    """A work unit claimed by one worker."""
+    def __init__(self, unit_id: str, unit: Dict[str, Any], path: str, worker_id: str):
+        self.unit_id = unit_id
+        self.unit = unit
+        self.path = path
+        self.worker_id = worker_id
+
+    @property
+    def seed(self) -> int:
+        # Same sample for a unit no matter which worker processes it
+        return int(self.unit_id[5:], 16) % (2 ** 31)
+
+
+class WorkQueue:
+    """
+    A work queue on a shared filesystem. It needs no external service.
+
+        <queue_dir>/config.json             ingest options, set by the coordinator
+        <queue_dir>/pending/<unit>.json     waiting to be claimed
+        <queue_dir>/leased/<unit>.json@<w>  claimed by worker w; mtime = last heartbeat
+        <queue_dir>/done/<unit>.json        result record (shards + serialized stats)
+
+    Claiming is an atomic rename out of pending/, so only one worker wins.
+    Leases not heartbeated for `lease_seconds` are renamed back to pending/.
+    Completion is an atomic link into done/, so only one result is ever kept.
+    Hosts need roughly synchronized clocks.
+    """
+    def __init__(self, queue_dir: str, lease_seconds: Optional[float] = None):
+        self.queue_dir = queue_dir
+        self.pending_dir = os.path.join(queue_dir, "pending")
+        self.leased_dir = os.path.join(queue_dir, "leased")
+        self.done_dir = os.path.join(queue_dir, "done")
+        for d in (self.pending_dir, self.leased_dir, self.done_dir):
+            os.makedirs(d, exist_ok=True)
+
+        if lease_seconds is None:
+            lease_seconds = self.read_config().get("lease_seconds", 300)
+        self.lease_seconds = lease_seconds
+
+    @property
+    def config_path(self) -> str:
+        return os.path.join(self.queue_dir, "config.json")
+
+    def write_config(self, config: Dict[str, Any]):
+        _write_json_atomic(self.config_path, config)
+
+    def read_config(self) -> Dict[str, Any]:
+        if not os.path.exists(self.config_path):
+            return {}
+        with open(self.config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _has_unit(self, name: str) -> bool:
+        if os.path.exists(os.path.join(self.pending_dir, name)):
+            return True
+        if os.path.exists(os.path.join(self.done_dir, name)):
+            return True
+        with os.scandir(self.leased_dir) as entries:
+            return any(e.name.split("@")[0] == name for e in entries)
+
+    def enqueue(self, units: Iterable[Dict[str, Any]]) -> int:
+        """Adds units not already pending, leased or done. Returns how many were added."""
+        added = 0
+        for unit in units:
+            name = unit_id(unit) + ".json"
+            if self._has_unit(name):
+                continue
+            _write_json_atomic(os.path.join(self.pending_dir, name), unit)
+            added += 1
+        return added
+
+    def lease(self, worker_id: str) -> Optional[Lease]:
+        """Claims the next pending unit, or returns None if nothing is pending."""
+        self.requeue_expired()
+        with os.scandir(self.pending_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.endswith(".json"):
+                    continue
+                leased_path = os.path.join(self.leased_dir, f"{entry.name}@{worker_id}")
+                try:
+                    # Touch first: rename keeps the mtime, and a stale one would
+                    # let requeue_expired() take the unit straight back
+                    os.utime(entry.path)
+                    os.rename(entry.path, leased_path)
+                except FileNotFoundError:
+                    continue  # Another worker claimed it first
+                with open(leased_path, "r", encoding="utf-8") as f:
+                    unit = json.load(f)
+                return Lease(entry.name[:-len(".json")], unit, leased_path, worker_id)
+        return None
+
+    def heartbeat(self, lease: Lease):
+        """Extends a lease. Raises LeaseLost if it was requeued meanwhile."""
+        try:
+            os.utime(lease.path)
+        except FileNotFoundError:
+            raise LeaseLost(f"Lease on {lease.unit_id} expired")
+
+    def requeue_expired(self) -> int:
+        """Returns expired leases (e.g. from dead workers) to pending/."""
+        requeued = 0
+        now = time.time()
+        with os.scandir(self.leased_dir) as entries:
+            for entry in entries:
+                name = entry.name.split("@")[0]
+                try:
+                    if now - entry.stat().st_mtime < self.lease_seconds:
+                        continue
+                    if os.path.exists(os.path.join(self.done_dir, name)):
+                        os.remove(entry.path)
+                        continue
+                    os.rename(entry.path, os.path.join(self.pending_dir, name))
+                except FileNotFoundError:
+                    continue  # Heartbeat, completion or another requeue got there first
+                print(f"   ♻️  Requeued expired lease: {entry.name}")
+                requeued += 1
+        return requeued
+
+    def complete(self, lease: Lease, result: Dict[str, Any]) -> bool:
+        """Records a unit's result. Returns False if another worker already completed it."""
+        done_path = os.path.join(self.done_dir, f"{lease.unit_id}.json")
+        tmp = os.path.join(self.done_dir, f".{lease.unit_id}.{lease.worker_id}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        try:
+            os.link(tmp, done_path)  # Fails if the file exists: first result wins
+            won = True
+        except FileExistsError:
+            won = False
+        finally:
+            os.remove(tmp)
+
+        try:
+            os.remove(lease.path)
+        except FileNotFoundError:
+            pass
+        return won
+
+    def status(self) -> Dict[str, int]:
+        def count(d):
+            with os.scandir(d) as entries:
+                return sum(1 for e in entries if ".json" in e.name and not e.name.startswith("."))
+        return {
+            "pending": count(self.pending_dir),
+            "leased": count(self.leased_dir),
+            "done": count(self.done_dir)
+        }
+
+    def result_paths(self) -> Iterator[str]:
+        with os.scandir(self.done_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and not entry.name.startswith("."):
+                    yield entry.path
+
+
+class _Heartbeat:
+    """Renews the lease after input batches, at most every `interval` seconds."""
+    def __init__(self, queue: WorkQueue, lease: Lease, interval: float):
+        self.queue = queue
+        self.lease = lease
+        self.interval = interval
+        self.last = time.time()
+
+    def __call__(self):
+        if time.time() - self.last >= self.interval:
+            self.queue.heartbeat(self.lease)
+            self.last = time.time()
+
+
+class DistributedWorker:
+    """
+    Leases units from a WorkQueue and runs the ingest pipeline on each one.
+    Shards are named {output}-{unit}-{worker}-NNNN.jsonl, so retries and
+    concurrent attempts never write to the same file.
+    """
+    def __init__(self, queue: WorkQueue, worker_id: Optional[str] = None, poll_seconds: float = 5.0):
+        self.queue = queue
+        self.config = queue.read_config()
+        if "output" not in self.config:
+            raise ValueError(f"No config.json in queue {queue.queue_dir}; run the coordinator first")
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.worker_id = re.sub(r"[^A-Za-z0-9_.-]", "_", worker_id)
+        self.poll_seconds = poll_seconds
+
+    def run(self) -> int:
+        """Processes units until none are pending or leased. Returns units completed."""
+        completed = 0
+        while True:
+            lease = self.queue.lease(self.worker_id)
+            if lease is None:
+                if self.queue.status()["leased"] == 0:
+                    return completed
+                # Others are still working; wait in case their leases expire
+                time.sleep(self.poll_seconds)
+                continue
+            if self.process(lease):
+                completed += 1
+
+    def _build(self, lease: Lease) -> Dataset:
+        cfg = self.config
+        dataset = Dataset.from_files(
+            [lease.unit],
+            text_column=cfg["col"],
+            csv_backend=cfg["csv_backend"],
+            keep_original_row=cfg["original_row"],
+            on_error="warn",
+            profile=cfg["profile"]
+        )
+        if cfg["sample"] < 1.0:
+            dataset = dataset.sample(cfg["sample"], seed=lease.seed)
+        return dataset.validate(DataValidator(
+            min_length=10,
+            check_english=cfg["english"],
+            max_symbol_ratio=0.3
+        ))
+
+    def process(self, lease: Lease) -> bool:
+        cfg = self.config
+        print(f"\n📦 [{self.worker_id}] {lease.unit_id}: {os.path.basename(lease.unit['path'])}")
+
+        prefix = f"{cfg['output']}-{lease.unit_id}-{self.worker_id}"
+        writer = ShardedWriter(prefix, shard_size=cfg["shard_size"], compress=cfg["compress"])
+        heartbeat = _Heartbeat(self.queue, lease, interval=self.queue.lease_seconds / 3)
+
+        try:
+            # Liveness follows input progress, so units whose rows are all dropped keep their lease
+            stats = self._build(lease).write(writer, progress=heartbeat)
+        except LeaseLost as e:
+            print(f"\n⚠️  {e}; abandoning unit")
+            return False
+        except Exception as e:
+            print(f"\n⚠️  Unit {lease.unit_id} failed: {e}")
+            return self.queue.complete(lease, {"unit": lease.unit, "worker": self.worker_id, "error": str(e)})
+        finally:
+            writer.close()
+
+        result = {
+            "unit": lease.unit,
+            "worker": self.worker_id,
+            "files": [os.path.basename(f) for f in writer.written_files()],
+            "stats": stats.to_state()
+        }
+        return self.queue.complete(lease, result)
+
+
+def reduce_queue(queue: WorkQueue) -> DatasetStats:
+    """
+    Merges every unit's DatasetStats and writes one manifest.json (and
+    profile.json when profiling) covering all worker shards.
+    files_processed counts input files, not units (byte ranges of one file count once).
+    Shards left by abandoned attempts are deleted.
+    """
+    status = queue.status()
+    if status["pending"] or status["leased"]:
+        raise RuntimeError(f"Queue not finished: {status['pending']} pending, {status['leased']} leased")
+
+    cfg = queue.read_config()
+    output_prefix = cfg["output"]
+    output_dir = os.path.dirname(os.path.abspath(output_prefix))
+
+    # Order results by input position; load each record only when merging it
+    order = []
+    for path in queue.result_paths():
+        with open(path, "r", encoding="utf-8") as f:
+            unit = json.load(f)["unit"]
+        order.append(((unit["path"], unit.get("start", 0)), path))
+
+    stats = DatasetStats()
+    files: List[str] = []
+    paths = set()
+    failed = 0
+    for _, path in sorted(order):
+        with open(path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        if "error" in result:
+            failed += 1
+            print(f"⚠️  Failed unit {result['unit']['path']}: {result['error']}")
+            continue
+        stats.merge(DatasetStats.from_state(result["stats"]))
+        files.extend(result["files"])
+        paths.add(result["unit"]["path"])
+    stats.files_processed = len(paths)
+
+    # Remove shards from attempts that lost their lease
+    kept = set(files)
+    unit_prefix = f"{os.path.basename(output_prefix)}-unit-"
+    with os.scandir(output_dir) as entries:
+        orphans = [e.path for e in entries if e.name.startswith(unit_prefix) and e.name not in kept]
+    for orphan in orphans:
+        os.remove(orphan)
+
+    if stats.valid_count > 0:
+        manifest_gen = ManifestGenerator(output_prefix)
+        manifest_gen.generate(stats.valid_count, files=files)
+        if stats.profile is not None:
+            stats.profile.save(manifest_gen.output_dir)
+
+    if failed:
+        print(f"⚠️  {failed} unit(s) failed")
+    return stats
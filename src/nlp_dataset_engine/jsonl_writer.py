@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Iterator, Dict, Any
+from typing import Iterator, Iterable, Dict, Any, List
 
 class JSONLWriter:
     """
@@ -22,4 +22,18 @@ class JSONLWriter:
             for item in data_stream:
                 f.write(json.dumps(item) + '\n')
                 count += 1
-        return count
\ No newline at end of file
+        return count
+
+    def write_batches(self, batches: Iterable[List[Dict[str, Any]]]) -> int:
+        """
+        Batched variant of write_stream: one write() call per batch.
+        Returns the count of lines written.
+        """
+        count = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            for batch in batches:
+                f.write(''.join([json.dumps(item) + '\n' for item in batch]))
+                count += len(batch)
+        return count
@@ -1,16 +1,16 @@
-import json
 from pathlib import Path
-from typing import Generator, Dict, Union, List
+from typing import Generator, Dict
 from .validators import DataValidator
+from .dataset import Dataset
 
 class DatasetLoader:
     """
     A memory-efficient loader for NLP datasets with validation and observability.
+    Thin wrapper over the lazy Dataset engine (text files, one record per line).
     """
 
     def __init__(self, source_path: str, min_length: int = 10):
         self.source_path = Path(source_path)
-        self.validator = DataValidator(min_length=min_length)
         # Observability: Track what happens
         self.stats = {
             "total_processed": 0,
@@ -21,41 +21,35 @@ class DatasetLoader:
         if not self.source_path.exists():
             raise FileNotFoundError(f"Path not found: {source_path}")
 
-    def stream_data(self) -> Generator[Dict[str, str], None, None]:
-        """Lazy-loads and VALIDATES data line by line."""
-        # Reset stats at start of stream
-        self.stats = {k: 0 for k in self.stats}
-        
+        # Every line is a record, blank ones included (they count as dropped),
+        # and a single file is read as text whatever its extension
+        options = {"file_format": "text", "keep_blank_lines": True}
         if self.source_path.is_file():
-            yield from self._process_file(self.source_path)
+            source = Dataset.from_files([str(self.source_path)], **options)
         else:
-            for file_path in self.source_path.glob("*.txt"):
-                yield from self._process_file(file_path)
+            source = Dataset.from_path(str(self.source_path), extensions=[".txt"], **options)
+        self.dataset = source.validate(DataValidator(min_length=min_length))
+
+    def _sync_stats(self):
+        stats = self.dataset.stats
+        self.stats = {
+            "total_processed": stats.total_processed,
+            "dropped_too_short": stats.dropped_count,
+            "valid_yielded": stats.valid_count
+        }
 
-    def _process_file(self, file_path: Path) -> Generator[Dict[str, str], None, None]:
-        """Helper to read and filter a single file."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                self.stats["total_processed"] += 1
-                
-                clean_line = line.strip()
-                record = {"text": clean_line, "source": file_path.name}
-                
-                if self.validator.validate(record):
-                    self.stats["valid_yielded"] += 1
-                    yield record
-                else:
-                    self.stats["dropped_too_short"] += 1
+    def stream_data(self) -> Generator[Dict[str, str], None, None]:
+        """Lazy-loads and VALIDATES data line by line."""
+        for batch in self.dataset.iter_batches():
+            self._sync_stats()
+            yield from batch
+        if self.dataset.stats is not None:
+            self._sync_stats()
 
     def export_to_jsonl(self, output_path: str) -> Dict[str, int]:
         """
         Writes valid data to a JSONL file and returns final stats.
         """
-        out = Path(output_path)
-        out.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(out, "w", encoding="utf-8") as f:
-            for record in self.stream_data():
-                f.write(json.dumps(record) + "\n")
-        
-        return self.stats
\ No newline at end of file
+        self.dataset.write_jsonl(output_path)
+        self._sync_stats()
+        return self.stats
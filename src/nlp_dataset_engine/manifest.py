@@ -2,7 +2,7 @@ import json
 import os
 import glob
 import datetime
-from typing import List, Dict
+from typing import Dict, List, Optional
 from .hashing import calculate_sha256
 
 class ManifestGenerator:
@@ -16,13 +16,21 @@ class ManifestGenerator:
         self.output_dir = os.path.dirname(os.path.abspath(output_prefix))
         self.base_name = os.path.basename(output_prefix)
 
-    def generate(self, total_records: int):
+    def generate(self, total_records: int, token_index: Optional[str] = None,
+                 files: Optional[List[str]] = None):
+        """
+        Writes manifest.json. By default every {prefix}-*.jsonl[.gz] shard in the
+        output folder is listed; pass `files` to list an explicit set (e.g. merged worker shards).
+        """
         manifest_path = os.path.join(self.output_dir, "manifest.json")
         
-        # Find all generated shards (jsonl or jsonl.gz)
-        # We look for files starting with the prefix in the same directory
-        search_pattern = os.path.join(self.output_dir, f"{self.base_name}-*.jsonl*")
-        files = sorted(glob.glob(search_pattern))
+        if files is not None:
+            files = [os.path.join(self.output_dir, os.path.basename(f)) for f in files]
+        else:
+            # Find all generated shards (jsonl or jsonl.gz)
+            # We look for files starting with the prefix in the same directory
+            search_pattern = os.path.join(self.output_dir, f"{self.base_name}-*.jsonl*")
+            files = sorted(glob.glob(search_pattern))
         
         file_entries = []
         
@@ -45,8 +53,37 @@ class ManifestGenerator:
             "total_files": len(files),
             "files": file_entries
         }
+
+        # Packed token shards, referenced so training can mmap them directly
+        if token_index is not None:
+            manifest["token_shards"] = self._token_entries(token_index)
         
         with open(manifest_path, "w", encoding="utf-8") as f:
             json.dump(manifest, f, indent=2)
             
-        print(f"✅ Manifest saved to: {manifest_path}")
\ No newline at end of file
+        print(f"✅ Manifest saved to: {manifest_path}")
+
+    def _token_entries(self, token_index: str) -> Dict:
+        with open(token_index, "r", encoding="utf-8") as f:
+            index = json.load(f)
+
+        shard_entries = []
+        for shard in index["shards"]:
+            file_path = os.path.join(self.output_dir, shard["filename"])
+            print(f"   Hashing: {shard['filename']}")
+            shard_entries.append({
+                "filename": shard["filename"],
+                "sha256": calculate_sha256(file_path),
+                "size_bytes": os.path.getsize(file_path),
+                "num_sequences": shard["num_sequences"]
+            })
+
+        return {
+            "index": os.path.basename(token_index),
+            "index_sha256": calculate_sha256(token_index),
+            "tokenizer": index["tokenizer"],
+            "dtype": index["dtype"],
+            "seq_len": index["seq_len"],
+            "total_sequences": index["total_sequences"],
+            "files": shard_entries
+        }
@@ -0,0 +1,200 @@
+import gc
+import os
+import sys
+from typing import Dict, Any, Optional, Union
+
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(text: str) -> int:
+    """Parses sizes like '512M', '2G', '1.5g' or plain bytes into a byte count."""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+def current_rss() -> Optional[int]:
+    """
+    Resident set size of this process in bytes, or None if unavailable.
+    Uses /proc on Linux and psutil (optional) elsewhere.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+class SpillableSet:
+    """
+    A set of str/bytes keys with bounded memory.
+    Keys live in a Python set until `max_items` (or an explicit spill()),
+    then move to an on-disk SQLite table; lookups check both.
+    """
+    def __init__(self, max_items: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.max_items = max_items
+        self.spill_dir = spill_dir
+        self._memory = set()
+        self._memory_bytes = 0
+        self._db = None  # sqlite3.Connection, opened on first spill
+        self._db_path: Optional[str] = None
+        self._spilled = 0
+
+    def __contains__(self, key: Union[str, bytes]) -> bool:
+        if key in self._memory:
+            return True
+        if self._db is None:
+            return False
+        return self._db.execute("SELECT 1 FROM keys WHERE k = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._spilled
+
+    def add(self, key: Union[str, bytes]):
+        if key in self._memory:
+            return
+        self._memory.add(key)
+        self._memory_bytes += sys.getsizeof(key)
+        if self.max_items is not None and len(self._memory) >= self.max_items:
+            self.spill()
+
+    def memory_usage(self) -> int:
+        return sys.getsizeof(self._memory) + self._memory_bytes
+
+    def spill(self):
+        """Moves every in-memory key to disk."""
+        if not self._memory:
+            return
+        if self._db is None:
+            import sqlite3
+            import tempfile
+            fd, self._db_path = tempfile.mkstemp(prefix="nlp_engine_spill_", suffix=".db", dir=self.spill_dir)
+            os.close(fd)
+            self._db = sqlite3.connect(self._db_path)
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE keys (k PRIMARY KEY) WITHOUT ROWID")
+
+        before = self._db.total_changes
+        self._db.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((k,) for k in self._memory))
+        self._db.commit()
+        self._spilled += self._db.total_changes - before
+
+        self._memory = set()
+        self._memory_bytes = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._db_path)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class MemoryMonitor:
+    """
+    Enforces a soft memory budget across the ingest path.
+
+    Components register with a name and expose memory_usage() (bytes) and,
+    optionally, spill(). check() samples process RSS; when over budget it runs
+    the garbage collector and asks the biggest components to spill first,
+    until the bytes they released cover the overshoot.
+
+    The tracemalloc heap is used instead with trace=True, or when a budget is
+    set and RSS is unavailable. Tracing slows Python down several times, so
+    without a budget a missing RSS is just reported as unavailable.
+
+    RSS rarely shrinks after Python frees objects, so after a back-off the
+    monitor waits until usage has grown by `regrow_bytes` (default: 1/16 of
+    the budget, at least 1 MiB) before backing off again.
+    """
+    def __init__(self, max_bytes: Optional[int] = None, trace: bool = False,
+                 regrow_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.trace = trace or (max_bytes is not None and current_rss() is None)
+        if self.trace:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        if regrow_bytes is None:
+            regrow_bytes = max((max_bytes or 0) // 16, 1 << 20)
+        self.regrow_bytes = regrow_bytes
+        self.components: Dict[str, Any] = {}
+        self.component_peaks: Dict[str, int] = {}
+        self.peak_bytes = 0
+        self.spill_events = 0
+        self._backed_off_at: Optional[int] = None  # usage at the last back-off
+
+    def register(self, name: str, component: Any):
+        if component is not None and hasattr(component, "memory_usage"):
+            self.components[name] = component
+
+    def usage(self) -> Optional[int]:
+        if self.trace:
+            import tracemalloc
+            return tracemalloc.get_traced_memory()[0]
+        return current_rss()
+
+    @property
+    def source(self) -> str:
+        if self.trace:
+            return "tracemalloc"
+        return "rss" if current_rss() is not None else "unavailable"
+
+    def _sample_components(self) -> Dict[str, int]:
+        sizes = {}
+        for name, component in self.components.items():
+            sizes[name] = component.memory_usage()
+            self.component_peaks[name] = max(self.component_peaks.get(name, 0), sizes[name])
+        return sizes
+
+    def check(self) -> Optional[int]:
+        """Samples memory and backs off if over budget. Returns current usage (None if unavailable)."""
+        used = self.usage()
+        sizes = self._sample_components()
+        if used is None:
+            return None
+        self.peak_bytes = max(self.peak_bytes, used)
+
+        if self.max_bytes is None or used <= self.max_bytes:
+            self._backed_off_at = None
+            return used
+        if self._backed_off_at is not None and used < self._backed_off_at + self.regrow_bytes:
+            return used
+
+        gc.collect()
+        overshoot = used - self.max_bytes
+        released = 0
+        for name in sorted(sizes, key=sizes.get, reverse=True):
+            if released >= overshoot:
+                break
+            component = self.components[name]
+            if hasattr(component, "spill"):
+                component.spill()
+                after = component.memory_usage()
+                if after < sizes[name]:
+                    self.spill_events += 1
+                    released += sizes[name] - after
+        self._backed_off_at = used
+        return used
+
+    def get_report(self) -> Dict[str, Any]:
+        self._sample_components()
+        mb = 1 << 20
+        source = self.source
+        return {
+            "source": source,
+            "peak_mb": round(self.peak_bytes / mb, 1) if source != "unavailable" else None,
+            "budget_mb": round(self.max_bytes / mb, 1) if self.max_bytes else None,
+            "spill_events": self.spill_events,
+            "component_peak_mb": {name: round(b / mb, 2) for name, b in self.component_peaks.items()}
+        }
@@ -0,0 +1,219 @@
+import json
+import os
+import sys
+from array import array
+from collections import deque
+from typing import Dict, Any, List
+from .tokenizer import load_tokenizer
+
+# Per-process tokenizer, built once by the pool initializer
+_worker_tokenizer = None
+
+def _init_worker(spec: str):
+    global _worker_tokenizer
+    _worker_tokenizer = load_tokenizer(spec)
+
+def _encode_texts(tokenizer, typecode: str, texts: List[str]) -> bytes:
+    """Encodes documents into one EOS-separated token stream (raw array bytes)."""
+    tokens = array(typecode)
+    eos = tokenizer.eos_id
+    for text in texts:
+        tokens.extend(tokenizer.encode(text))
+        tokens.append(eos)
+    return tokens.tobytes()
+
+def _encode_in_worker(typecode: str, texts: List[str]) -> bytes:
+    return _encode_texts(_worker_tokenizer, typecode, texts)
+
+
+class PackedSequenceWriter:
+    """
+    Tokenizes valid rows and packs them into fixed-length training sequences.
+
+    Documents are concatenated with an EOS token between them and cut into
+    rows of `seq_len` tokens, written as raw little-endian uint16/uint32
+    binary shards ({prefix}-tokens-0000.bin, ...) plus an index file
+    ({prefix}-tokens.idx.json). Each shard is a flat [num_sequences, seq_len]
+    array that training code can memory-map directly.
+
+    With workers > 0 tokenization runs in a process pool, batches in flight
+    are bounded, and output order is preserved.
+    """
+    def __init__(self, output_prefix: str, tokenizer: str = "byte", seq_len: int = 2048,
+                 sequences_per_shard: int = 65536, workers: int = 0):
+        self.output_prefix = output_prefix
+        self.tokenizer_spec = tokenizer
+        self.tokenizer = load_tokenizer(tokenizer)
+        self.seq_len = seq_len
+        self.sequences_per_shard = sequences_per_shard
+
+        if self.tokenizer.vocab_size <= 1 << 16:
+            self.dtype, self.typecode = "uint16", "H"
+        else:
+            self.dtype, self.typecode = "uint32", "I" if array("I").itemsize == 4 else "L"
+
+        self.buffer = array(self.typecode)
+        self.shards: List[Dict[str, Any]] = []
+        self.file_handle = None
+        self.current_count = 0
+        self.total_tokens = 0
+        self.padded_tokens = 0
+
+        self.workers = workers
+        self.pool = None
+        self.pending = deque()
+        if workers > 0:
+            import multiprocessing
+            self.pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(tokenizer,))
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.output_prefix}-tokens.idx.json"
+
+    def _open_new_shard(self):
+        if self.file_handle:
+            self.file_handle.close()
+        filename = f"{self.output_prefix}-tokens-{len(self.shards):04d}.bin"
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self.file_handle = open(filename, "wb")
+        self.shards.append({"filename": os.path.basename(filename), "num_sequences": 0})
+        self.current_count = 0
+        print(f"   --> Writing token shard: {os.path.basename(filename)}")
+
+    def _write_sequences(self, tokens: array):
+        """Writes whole sequences from `tokens`, rotating shards as needed."""
+        if sys.byteorder == "big":
+            tokens.byteswap()
+        num_sequences = len(tokens) // self.seq_len
+        start = 0
+        while start < num_sequences:
+            if self.file_handle is None or self.current_count >= self.sequences_per_shard:
+                self._open_new_shard()
+            n = min(num_sequences - start, self.sequences_per_shard - self.current_count)
+            self.file_handle.write(tokens[start * self.seq_len:(start + n) * self.seq_len].tobytes())
+            self.current_count += n
+            self.shards[-1]["num_sequences"] += n
+            start += n
+
+    def _consume(self, encoded: bytes):
+        chunk = array(self.typecode)
+        chunk.frombytes(encoded)
+        self.total_tokens += len(chunk)
+        self.buffer.extend(chunk)
+
+        full = len(self.buffer) // self.seq_len * self.seq_len
+        if full:
+            self._write_sequences(self.buffer[:full])
+            del self.buffer[:full]
+
+    def write_batch(self, items: List[Dict[str, Any]]):
+        texts = [item["text"] for item in items]
+        if self.pool is None:
+            self._consume(_encode_texts(self.tokenizer, self.typecode, texts))
+            return
+
+        self.pending.append(self.pool.apply_async(_encode_in_worker, (self.typecode, texts)))
+        # Backpressure: keep at most two batches per worker in flight
+        while len(self.pending) > 2 * self.workers:
+            self._consume(self.pending.popleft().get())
+
+    def memory_usage(self) -> int:
+        """Token buffer plus a rough estimate for batches still in flight."""
+        return self.buffer.itemsize * (len(self.buffer) + len(self.pending) * self.seq_len)
+
+    def spill(self):
+        """Backs off under memory pressure: drains in-flight batches and writes them out."""
+        while self.pending:
+            self._consume(self.pending.popleft().get())
+
+    def close(self):
+        if self.pool is not None:
+            self.spill()
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+        # Pad the last partial sequence with EOS so no tokens are lost
+        if self.buffer:
+            self.padded_tokens = self.seq_len - len(self.buffer)
+            self.buffer.extend([self.tokenizer.eos_id] * self.padded_tokens)
+            self._write_sequences(self.buffer)
+            self.buffer = array(self.typecode)
+
+        if self.file_handle:
+            self.file_handle.close()
+            self.file_handle = None
+        self._write_index()
+
+    def _write_index(self):
+        index = {
+            "format": "packed-tokens-v1",
+            "tokenizer": self.tokenizer_spec,
+            "vocab_size": self.tokenizer.vocab_size,
+            "eos_id": self.tokenizer.eos_id,
+            "dtype": self.dtype,
+            "byte_order": "little",
+            "seq_len": self.seq_len,
+            "total_sequences": sum(s["num_sequences"] for s in self.shards),
+            "total_tokens": self.total_tokens,
+            "padded_tokens": self.padded_tokens,
+            "shards": self.shards
+        }
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+
+class PackedSequenceReader:
+    """
+    Memory-maps the shards listed in a packed token index.
+    reader[i] returns sequence i as a memoryview of seq_len tokens (no copy).
+    With numpy, np.memmap(path, dtype=index['dtype'], mode='r').reshape(-1, seq_len)
+    gives the same view per shard.
+
+    close() (or a with-block) releases the maps and file descriptors;
+    sequences taken from the reader must not be held past that point.
+    """
+    def __init__(self, index_path: str):
+        import mmap
+        with open(index_path, "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.seq_len = self.index["seq_len"]
+        typecode = "H" if self.index["dtype"] == "uint16" else "I"
+
+        base_dir = os.path.dirname(os.path.abspath(index_path))
+        self._views = []
+        self._maps = []
+        self._files = []
+        for shard in self.index["shards"]:
+            f = open(os.path.join(base_dir, shard["filename"]), "rb")
+            self._files.append(f)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self._views.append(memoryview(mapped).cast(typecode))
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        for f in self._files:
+            f.close()
+        self._views, self._maps, self._files = [], [], []
+
+    def __enter__(self) -> "PackedSequenceReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.index["total_sequences"]
+
+    def __getitem__(self, i: int) -> memoryview:
+        if i < 0:
+            i += len(self)
+        for shard, view in zip(self.index["shards"], self._views):
+            if i < shard["num_sequences"]:
+                return view[i * self.seq_len:(i + 1) * self.seq_len]
+            i -= shard["num_sequences"]
+        raise IndexError("sequence index out of range")
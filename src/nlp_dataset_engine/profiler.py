@@ -0,0 +1,113 @@
+import json
+import os
+from collections import Counter
+from typing import Dict, Any, Optional
+from .sketches import HyperLogLog, TopK, LengthHistogram, hash64
+
+class DatasetProfile:
+    """
+    Bounded-memory profile of the text written to a dataset.
+    Every field is a streaming sketch, so memory stays fixed no matter how
+    many rows are seen, and profiles from separate workers can be merged.
+    """
+    # Rows whose token counts are pre-aggregated before the sketches are updated
+    FLUSH_ROWS = 1024
+
+    def __init__(self, top_k: int = 20):
+        self.char_lengths = LengthHistogram()
+        self.token_lengths = LengthHistogram()
+        self.distinct_documents = HyperLogLog()
+        self.vocabulary = HyperLogLog()
+        self.top_tokens = TopK(k=top_k)
+        self.top_sources = TopK(k=top_k)
+        self._pending_tokens: Counter = Counter()
+        self._pending_sources: Counter = Counter()
+        self._pending_rows = 0
+
+    def add(self, text: str, source: Optional[str] = None):
+        """Records a single (valid) row."""
+        tokens = text.lower().split()
+        self.char_lengths.add(len(text))
+        self.token_lengths.add(len(tokens))
+        self.distinct_documents.add_hash(hash64(text))
+
+        self._pending_tokens.update(tokens)
+        if source is not None:
+            self._pending_sources[source] += 1
+        self._pending_rows += 1
+        if self._pending_rows >= self.FLUSH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        """Applies pending counts: one hash and one sketch update per distinct token."""
+        for token, count in self._pending_tokens.items():
+            h = hash64(token)
+            self.vocabulary.add_hash(h)
+            self.top_tokens.add(token, count, h=h)
+        for source, count in self._pending_sources.items():
+            self.top_sources.add(source, count)
+        self._pending_tokens = Counter()
+        self._pending_sources = Counter()
+        self._pending_rows = 0
+
+    def memory_usage(self) -> int:
+        """Fixed size: the sketch counters plus at most 2*top_k candidate keys (pending counts excluded)."""
+        size = len(self.distinct_documents.registers) + len(self.vocabulary.registers)
+        for hist in (self.char_lengths, self.token_lengths):
+            size += hist.counts.itemsize * len(hist.counts)
+        for top in (self.top_tokens, self.top_sources):
+            size += sum(t.itemsize * len(t) for t in top.sketch.tables)
+            size += sum(len(key) for key in top.candidates)
+        return size
+
+    def merge(self, other: "DatasetProfile"):
+        self._flush()
+        other._flush()
+        self.char_lengths.merge(other.char_lengths)
+        self.token_lengths.merge(other.token_lengths)
+        self.distinct_documents.merge(other.distinct_documents)
+        self.vocabulary.merge(other.vocabulary)
+        self.top_tokens.merge(other.top_tokens)
+        self.top_sources.merge(other.top_sources)
+
+    def get_report(self) -> Dict[str, Any]:
+        self._flush()
+        return {
+            "rows": self.char_lengths.total,
+            "char_length": self.char_lengths.summary(),
+            "token_length": self.token_lengths.summary(),
+            "approx_distinct_documents": self.distinct_documents.count(),
+            "approx_vocabulary_size": self.vocabulary.count(),
+            "top_tokens": [{"token": t, "count": c} for t, c in self.top_tokens.top()],
+            "top_sources": [{"source": s, "count": c} for s, c in self.top_sources.top()]
+        }
+
+    def save(self, output_dir: str) -> str:
+        """Writes profile.json next to manifest.json and returns its path."""
+        profile_path = os.path.join(output_dir, "profile.json")
+        with open(profile_path, "w", encoding="utf-8") as f:
+            json.dump(self.get_report(), f, indent=2)
+        print(f"✅ Profile saved to: {profile_path}")
+        return profile_path
+
+    def to_state(self) -> Dict[str, Any]:
+        self._flush()
+        return {
+            "char_lengths": self.char_lengths.to_state(),
+            "token_lengths": self.token_lengths.to_state(),
+            "distinct_documents": self.distinct_documents.to_state(),
+            "vocabulary": self.vocabulary.to_state(),
+            "top_tokens": self.top_tokens.to_state(),
+            "top_sources": self.top_sources.to_state()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "DatasetProfile":
+        profile = cls()
+        profile.char_lengths = LengthHistogram.from_state(state["char_lengths"])
+        profile.token_lengths = LengthHistogram.from_state(state["token_lengths"])
+        profile.distinct_documents = HyperLogLog.from_state(state["distinct_documents"])
+        profile.vocabulary = HyperLogLog.from_state(state["vocabulary"])
+        profile.top_tokens = TopK.from_state(state["top_tokens"])
+        profile.top_sources = TopK.from_state(state["top_sources"])
+        return profile
@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .compression import smart_open
 
 class ShardedWriter:
@@ -45,6 +45,24 @@ class ShardedWriter:
         self.file_handle.write(json.dumps(item) + "\n")
         self.current_count += 1
 
+    def write_batch(self, items: List[Dict[str, Any]]):
+        """Writes a batch of items with one write() call per shard it touches."""
+        start = 0
+        while start < len(items):
+            if self.current_count >= self.shard_size:
+                self.current_shard_index += 1
+                self._open_new_shard()
+
+            chunk = items[start:start + self.shard_size - self.current_count]
+            self.file_handle.write("".join([json.dumps(item) + "\n" for item in chunk]))
+            self.current_count += len(chunk)
+            start += len(chunk)
+
+    def written_files(self) -> List[str]:
+        """Paths of every shard opened so far, in order."""
+        ext = ".jsonl.gz" if self.compress else ".jsonl"
+        return [f"{self.output_prefix}-{i:04d}{ext}" for i in range(self.current_shard_index + 1)]
+
     def close(self):
         if self.file_handle:
             self.file_handle.close()
\ No newline at end of file
@@ -0,0 +1,291 @@
+import base64
+import hashlib
+import math
+from array import array
+from typing import Dict, Any, List, Tuple, Optional
+
+def hash64(value: str) -> int:
+    """
+    Stable 64-bit hash of a string.
+    Python's built-in hash() is salted per process, so sketches built on
+    different workers would not be mergeable with it.
+    """
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class HyperLogLog:
+    """
+    Approximate distinct counter with fixed memory (2^precision bytes).
+    Standard error is roughly 1.04 / sqrt(2^precision), ~0.8% at p=14.
+    """
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+
+    def add(self, value: str):
+        self.add_hash(hash64(value))
+
+    def add_hash(self, h: int):
+        index = h & (self.num_registers - 1)
+        rest = h >> self.precision
+        # Rank = position of the lowest set bit in the remaining bits
+        width = 64 - self.precision
+        rank = (rest & -rest).bit_length() if rest else width + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # Small range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self.registers)).decode("ascii")
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(precision=state["precision"])
+        sketch.registers = bytearray(base64.b64decode(state["registers"]))
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Approximate frequency table with fixed memory (width x depth counters).
+    Estimates never undercount; overcount is bounded by total/width per row.
+    """
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.tables = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def add(self, value: str, count: int = 1) -> int:
+        """Adds `count` occurrences and returns the new estimate."""
+        return self.add_hash(hash64(value), count)
+
+    def add_hash(self, h: int, count: int = 1) -> int:
+        # Kirsch-Mitzenmacher double hashing: one 64-bit hash -> depth indexes
+        idx = h & 0xFFFFFFFF
+        step = (h >> 32) | 1
+        width = self.width
+        estimate = None
+        for table in self.tables:
+            idx %= width
+            table[idx] += count
+            if estimate is None or table[idx] < estimate:
+                estimate = table[idx]
+            idx += step
+        return estimate
+
+    def estimate(self, value: str) -> int:
+        return self.estimate_hash(hash64(value))
+
+    def estimate_hash(self, h: int) -> int:
+        idx = h & 0xFFFFFFFF
+        step = (h >> 32) | 1
+        estimate = None
+        for table in self.tables:
+            idx %= self.width
+            if estimate is None or table[idx] < estimate:
+                estimate = table[idx]
+            idx += step
+        return estimate
+
+    def merge(self, other: "CountMinSketch"):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge CountMinSketch with different dimensions")
+        for mine, theirs in zip(self.tables, other.tables):
+            for i, value in enumerate(theirs):
+                if value:
+                    mine[i] += value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "tables": [base64.b64encode(t.tobytes()).decode("ascii") for t in self.tables]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CountMinSketch":
+        sketch = cls(width=state["width"], depth=state["depth"])
+        for table, encoded in zip(sketch.tables, state["tables"]):
+            table[:] = array("Q", base64.b64decode(encoded))
+        return sketch
+
+
+class TopK:
+    """
+    Heavy hitters: a Count-Min sketch plus at most `k` candidate keys.
+    Memory is fixed by `k` and the sketch dimensions.
+    """
+    def __init__(self, k: int = 20, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width=width, depth=depth)
+        self.candidates: Dict[str, int] = {}
+        self._floor = 0  # Smallest candidate count once the table is full
+
+    def add(self, value: str, count: int = 1, h: Optional[int] = None):
+        """`h` is hash64(value), when the caller has already computed it."""
+        estimate = self.sketch.add_hash(hash64(value) if h is None else h, count)
+        if value in self.candidates:
+            previous = self.candidates[value]
+            self.candidates[value] = estimate
+            if previous > self._floor:
+                return  # The floor can only move when its holder grows
+        elif len(self.candidates) < self.k:
+            self.candidates[value] = estimate
+        elif estimate > self._floor:
+            weakest = min(self.candidates, key=self.candidates.get)
+            del self.candidates[weakest]
+            self.candidates[value] = estimate
+        else:
+            return
+        if len(self.candidates) >= self.k:
+            self._floor = min(self.candidates.values())
+
+    def merge(self, other: "TopK"):
+        self.sketch.merge(other.sketch)
+        keys = set(self.candidates) | set(other.candidates)
+        ranked = sorted(((self.sketch.estimate(key), key) for key in keys), reverse=True)
+        self.candidates = {key: est for est, key in ranked[:self.k]}
+        self._floor = min(self.candidates.values()) if len(self.candidates) >= self.k else 0
+
+    def top(self) -> List[Tuple[str, int]]:
+        return sorted(self.candidates.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"k": self.k, "sketch": self.sketch.to_state(), "candidates": self.candidates}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "TopK":
+        sketch = CountMinSketch.from_state(state["sketch"])
+        top = cls(k=state["k"], width=sketch.width, depth=sketch.depth)
+        top.sketch = sketch
+        top.candidates = dict(state["candidates"])
+        top._floor = min(top.candidates.values()) if len(top.candidates) >= top.k else 0
+        return top
+
+
+class LengthHistogram:
+    """
+    Fixed-size histogram for non-negative lengths.
+    Buckets are exact below `linear_limit`, then log-spaced (8 per power of two),
+    so quantiles stay within ~9% relative error using a few hundred counters.
+    """
+    SUB_BUCKETS = 8
+
+    def __init__(self, linear_limit: int = 64, max_power: int = 32):
+        self.linear_limit = linear_limit
+        self.max_power = max_power
+        self._base_power = int(math.log2(linear_limit))
+        log_buckets = (max_power - self._base_power) * self.SUB_BUCKETS
+        self.counts = array("Q", bytes(8 * (linear_limit + log_buckets)))
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _bucket(self, value: int) -> int:
+        if value < self.linear_limit:
+            return value
+        power = min(value.bit_length() - 1, self.max_power - 1)
+        offset = (value >> (power - 3)) & (self.SUB_BUCKETS - 1) if power >= 3 else 0
+        return self.linear_limit + (power - self._base_power) * self.SUB_BUCKETS + offset
+
+    def _bucket_bounds(self, bucket: int) -> Tuple[float, float]:
+        if bucket < self.linear_limit:
+            return float(bucket), float(bucket)
+        power, offset = divmod(bucket - self.linear_limit, self.SUB_BUCKETS)
+        power += self._base_power
+        step = 2 ** power / self.SUB_BUCKETS
+        low = 2 ** power + offset * step
+        return low, low + step - 1
+
+    def add(self, value: int):
+        self.counts[self._bucket(value)] += 1
+        self.total += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LengthHistogram"):
+        if (other.linear_limit, other.max_power) != (self.linear_limit, self.max_power):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for i, value in enumerate(other.counts):
+            if value:
+                self.counts[i] += value
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if self.total == 0:
+            return 0.0
+        rank = q * (self.total - 1)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            if not count:
+                continue
+            if seen + count > rank:
+                low, high = self._bucket_bounds(bucket)
+                # Interpolate inside the bucket, clamped to observed extremes
+                value = low + (high - low) * ((rank - seen) / count)
+                return float(min(max(value, self.min), self.max))
+            seen += count
+        return float(self.max)
+
+    def summary(self) -> Dict[str, Any]:
+        mean = self.sum / self.total if self.total else 0.0
+        return {
+            "count": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": round(mean, 2),
+            "p50": round(self.quantile(0.50), 1),
+            "p90": round(self.quantile(0.90), 1),
+            "p99": round(self.quantile(0.99), 1)
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "linear_limit": self.linear_limit,
+            "max_power": self.max_power,
+            "counts": base64.b64encode(self.counts.tobytes()).decode("ascii"),
+            "total": self.total,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LengthHistogram":
+        hist = cls(linear_limit=state["linear_limit"], max_power=state["max_power"])
+        hist.counts = array("Q", base64.b64decode(state["counts"]))
+        hist.total = state["total"]
+        hist.sum = state["sum"]
+        hist.min = state["min"]
+        hist.max = state["max"]
+        return hist
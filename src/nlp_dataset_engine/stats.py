@@ -1,26 +1,73 @@
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class DatasetStats:
     """
     Tracks real-time statistics during ingestion.
+    With profile=True, valid rows are also fed into a bounded-memory
+    DatasetProfile (length distributions, vocabulary, top tokens/sources).
     """
-    def __init__(self):
+    def __init__(self, profile: bool = False):
         self.total_processed = 0
         self.valid_count = 0
         self.dropped_count = 0
+        self.files_processed = 0
         self.start_time = time.time()
+        self.profile = None  # DatasetProfile; the sketch modules are only loaded when profiling
+        if profile:
+            from .profiler import DatasetProfile
+            self.profile = DatasetProfile()
 
-    def update(self, is_valid: bool):
+    def update(self, is_valid: bool, item: Optional[Dict[str, Any]] = None, source: Optional[str] = None):
         """
         Update counters for a single row.
         """
         self.total_processed += 1
         if is_valid:
             self.valid_count += 1
+            if self.profile is not None and item is not None:
+                self.profile.add(item["text"], source)
         else:
             self.dropped_count += 1
 
+    def merge(self, other: "DatasetStats"):
+        """
+        Folds another worker's stats into this one.
+        """
+        self.total_processed += other.total_processed
+        self.valid_count += other.valid_count
+        self.dropped_count += other.dropped_count
+        self.files_processed += other.files_processed
+        self.start_time = min(self.start_time, other.start_time)
+        if other.profile is not None:
+            if self.profile is None:
+                from .profiler import DatasetProfile
+                self.profile = DatasetProfile()
+            self.profile.merge(other.profile)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "total_processed": self.total_processed,
+            "valid_count": self.valid_count,
+            "dropped_count": self.dropped_count,
+            "files_processed": self.files_processed,
+            "start_time": self.start_time,
+            "profile": self.profile.to_state() if self.profile is not None else None
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "DatasetStats":
+        stats = cls()
+        stats.total_processed = state["total_processed"]
+        stats.valid_count = state["valid_count"]
+        stats.dropped_count = state["dropped_count"]
+        stats.files_processed = state.get("files_processed", 0)
+        stats.start_time = state["start_time"]
+        if state.get("profile") is not None:
+            from .profiler import DatasetProfile
+            stats.profile = DatasetProfile.from_state(state["profile"])
+        return stats
+
     def get_report(self) -> Dict[str, Any]:
         """
         Generate a summary report.
@@ -39,6 +86,7 @@ class DatasetStats:
             "valid_rows": self.valid_count,
             "dropped_rows": self.dropped_count,
             "drop_rate_percent": round(drop_rate, 2),
+            "files_processed": self.files_processed,
             "elapsed_seconds": round(elapsed, 2),
             "speed_rows_per_sec": rows_per_sec
         }
\ No newline at end of file
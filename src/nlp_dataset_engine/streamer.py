@@ -1,36 +1,343 @@
 import csv
-from typing import  Iterator, Dict, Optional
+import os
+from typing import Iterator, Dict, List, Optional, Union
+
+Row = Dict[str, str]
+Batch = List[Row]
+
+class MissingColumnError(ValueError):
+    """The requested text column is not in the CSV header."""
+
+def _read_header(filepath: str) -> Optional[List[str]]:
+    """Reads just the CSV header (None for an empty file), dropping a UTF-8 BOM."""
+    with open(filepath, mode="r", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if header:
+        header[0] = header[0].lstrip("\ufeff")
+    return header
+
+def _check_column(header: List[str], text_column: str):
+    if text_column not in header:
+        raise MissingColumnError(f"Column '{text_column}' not found in CSV headers: {header}")
+
+def _text_index(header: List[str], text_column: str) -> int:
+    """Position of the text column. DictReader keeps the last duplicate header, so we do too."""
+    _check_column(header, text_column)
+    return len(header) - 1 - header[::-1].index(text_column)
+
+def _original_row(header: List[str], values: List[Optional[str]]) -> str:
+    """Rebuilds str(row) exactly as csv.DictReader would have produced it."""
+    row = dict(zip(header, values))
+    if len(values) > len(header):
+        row[None] = values[len(header):]
+    else:
+        for key in header[len(values):]:
+            row[key] = None
+    return str(row)
+
+
+class CSVBackend:
+    """
+    A pluggable CSV parser. Backends yield batches of engine rows:
+    {'text': ..., 'original_row': ...} with blank texts already skipped.
+    Row semantics follow csv.DictReader, ragged rows and duplicate headers included.
+    """
+    name = "base"
+
+    def read_batches(self, filepath: str, text_column: str, batch_size: int,
+                     keep_original_row: bool = True) -> Iterator[Batch]:
+        raise NotImplementedError
+
+
+class StdlibBackend(CSVBackend):
+    """
+    Projection-aware csv.reader: only the text column is looked up per row,
+    and no per-row dict is built unless original_row is requested.
+    """
+    name = "stdlib"
+
+    def read_batches(self, filepath, text_column, batch_size, keep_original_row=True, skip: int = 0):
+        """`skip` drops the first rows that would be yielded (used to resume after a native backend)."""
+        with open(filepath, mode="r", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            header[0] = header[0].lstrip("\ufeff")
+            idx = _text_index(header, text_column)
+            width = len(header)
+            batch: Batch = []
+
+            for values in reader:
+                if not values:  # DictReader skips fully blank rows
+                    continue
+                content = values[idx].strip() if idx < len(values) else ""
+                if not content:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                if not keep_original_row:
+                    batch.append({"text": content})
+                elif len(values) == width:
+                    batch.append({"text": content, "original_row": str(dict(zip(header, values)))})
+                else:
+                    batch.append({"text": content, "original_row": _original_row(header, values)})
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+
+
+def _native_batch(header: List[str], idx: int, columns: List[List[Optional[str]]],
+                  keep_original_row: bool) -> Batch:
+    """Builds engine rows from positional column lists (text column at `idx` when keeping original rows, else columns[0])."""
+    if not keep_original_row:
+        return [{"text": t.strip()} for t in columns[0] if t and t.strip()]
+    batch = []
+    for values in zip(*columns):
+        t = values[idx]
+        if t and t.strip():
+            batch.append({"text": t.strip(), "original_row": str(dict(zip(header, values)))})
+    return batch
+
+
+# Text-mode reads (what DictReader saw) turn \r\n and lone \r into \n, even inside quoted fields
+_NEWLINE_PATTERN = "\r\n?"
+
+
+class ArrowBackend(CSVBackend):
+    """
+    pyarrow's multithreaded CSV reader. Parses large blocks in native code
+    and only converts the projected columns to Python strings.
+
+    Columns are read by position, so duplicate headers resolve like DictReader,
+    and newlines inside values are normalized like a text-mode read.
+    Arrow can only skip ragged rows, which DictReader keeps; once one is seen
+    the rest of the file is read by the stdlib backend, resuming after the
+    last row yielded.
+    """
+    name = "arrow"
+    block_size = 16 << 20
+
+    def read_batches(self, filepath, text_column, batch_size, keep_original_row=True):
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            raise ImportError("The 'arrow' CSV backend requires pyarrow: pip install pyarrow")
+
+        header = _read_header(filepath)
+        if not header:
+            return
+        idx = _text_index(header, text_column)
+
+        names = [f"c{i}" for i in range(len(header))]
+        columns = names if keep_original_row else [names[idx]]
+        ragged = []
+
+        def on_invalid_row(row):
+            ragged.append(row)
+            return "skip"
+
+        reader = pa_csv.open_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(block_size=self.block_size, column_names=names, skip_rows=1),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=on_invalid_row),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={c: pa.string() for c in columns},
+                strings_can_be_null=False
+            )
+        )
+
+        emitted = 0
+        for record_batch in reader:
+            if ragged:
+                break
+            values = [pc.replace_substring_regex(c, _NEWLINE_PATTERN, "\n").to_pylist()
+                      for c in record_batch.columns]
+            batch = _native_batch(header, idx, values, keep_original_row)
+            emitted += len(batch)
+            for start in range(0, len(batch), batch_size):
+                yield batch[start:start + batch_size]
+
+        if ragged:
+            reader.close()
+            yield from StdlibBackend().read_batches(filepath, text_column, batch_size, keep_original_row, skip=emitted)
+
+
+class PolarsBackend(CSVBackend):
+    """
+    polars' native CSV reader, read in streaming batches with all columns as strings.
+
+    Columns are renamed by position, so duplicate headers resolve like DictReader,
+    and newlines inside values are normalized like a text-mode read.
+    Text-only reads truncate ragged rows, which cannot change the text column.
+    With original_row, polars cannot tell a missing last field (None in
+    DictReader) from an empty one, and rejects extra fields; from the first
+    such row the file is read by the stdlib backend. So is any file polars
+    fails to parse (e.g. CR-only line endings, or `"a" ,1`).
+    """
+    name = "polars"
+
+    def read_batches(self, filepath, text_column, batch_size, keep_original_row=True):
+        try:
+            import polars as pl
+        except ImportError:
+            raise ImportError("The 'polars' CSV backend requires polars: pip install polars")
+
+        header = _read_header(filepath)
+        if not header:
+            return
+        idx = _text_index(header, text_column)
+
+        names = [f"c{i}" for i in range(len(header))]
+        columns = names if keep_original_row else [names[idx]]
+        normalized = [pl.col(c).str.replace_all(_NEWLINE_PATTERN, "\n") for c in columns]
+        options = dict(infer_schema_length=0, new_columns=names, truncate_ragged_lines=not keep_original_row)
+        emitted = 0
+        resume = False
+        try:
+            if hasattr(pl, "read_csv_batched"):
+                reader = pl.read_csv_batched(filepath, columns=columns, batch_size=batch_size, **options)
+                frames = iter(lambda: reader.next_batches(1), None)
+                frames = (batches[0] for batches in frames if batches)
+            else:
+                lazy = pl.scan_csv(filepath, empty_string_is_null=False, **options)
+                frames = lazy.select(columns).collect_batches(chunk_size=batch_size)
+
+            for frame in frames:
+                frame = frame.select(normalized)
+                values = [frame.get_column(c).to_list() for c in columns]
+                if keep_original_row:
+                    # A row whose last field is empty may be short: stop before it
+                    texts, last = values[idx], values[-1]
+                    cut = next((i for i, (t, v) in enumerate(zip(texts, last)) if not v and t and t.strip()), None)
+                    if cut is not None:
+                        values = [v[:cut] for v in values]
+                        resume = True
+                batch = _native_batch(header, idx, values, keep_original_row)
+                emitted += len(batch)
+                if batch:
+                    yield batch
+                if resume:
+                    break
+        except pl.exceptions.PolarsError:
+            # Ragged or otherwise unparseable here; the stdlib parser decides
+            resume = True
+
+        if resume:
+            yield from StdlibBackend().read_batches(filepath, text_column, batch_size, keep_original_row, skip=emitted)
+
+
+CSV_BACKENDS = {
+    "stdlib": StdlibBackend,
+    "arrow": ArrowBackend,
+    "polars": PolarsBackend,
+}
+
+def get_backend(backend: Union[str, CSVBackend]) -> CSVBackend:
+    """Resolves a backend name (or passes through a CSVBackend instance)."""
+    if isinstance(backend, CSVBackend):
+        return backend
+    if backend not in CSV_BACKENDS:
+        raise ValueError(f"Unknown CSV backend '{backend}'. Choose from: {sorted(CSV_BACKENDS)}")
+    return CSV_BACKENDS[backend]()
+
 
 class DatasetStreamer:
     """
     Memory-efficient CSV streamer.
-    Reads file line-by-line using generators.
+    Reads file in bounded batches using generators; the parser is pluggable.
     """
-    
-    def __init__(self, filepath: str, text_column: str = "text"):
+
+    def __init__(self, filepath: str, text_column: str = "text",
+                 backend: Union[str, CSVBackend] = "stdlib",
+                 keep_original_row: bool = True, batch_size: int = 1024):
         self.filepath = filepath
         self.text_column = text_column
+        self.backend = get_backend(backend)
+        self.keep_original_row = keep_original_row
+        self.batch_size = batch_size
 
-    def stream(self) -> Iterator[Dict[str, str]]:
+    def stream(self) -> Iterator[Row]:
         """
         Yields rows one by one.
-        Returns a dictionary: {'text': 'actual content', 'meta': ...}
+        Returns a dictionary: {'text': 'actual content', 'original_row': ...}
+        """
+        for batch in self.stream_batches():
+            yield from batch
+
+    def stream_batches(self) -> Iterator[Batch]:
+        """
+        Yields lists of up to batch_size rows.
+        Missing text columns raise MissingColumnError (a ValueError); parse/decoding failures raise RuntimeError.
         """
         try:
-            with open(self.filepath, mode="r", encoding="utf-8-sig") as f:
-                reader = csv.DictReader(f)
-                
-                # Check if the column actually exists
-                if reader.fieldnames and self.text_column not in reader.fieldnames:
-                    raise ValueError(f"Column '{self.text_column}' not found in CSV headers: {reader.fieldnames}")
-
-                for row in reader:
-                    content = row.get(self.text_column, "").strip()
-                    if content:
-                        yield {"text": content, "original_row": str(row)}
-                        
+            yield from self.backend.read_batches(
+                self.filepath, self.text_column, self.batch_size, self.keep_original_row
+            )
         except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {self.filepath}")
+        except (MissingColumnError, ImportError):
+            raise
         except Exception as e:
             raise RuntimeError(f"Error streaming file: {str(e)}")
-        
\ No newline at end of file
+
+
+class TextStreamer:
+    """
+    Line-oriented streamer for plain text files: one row per non-blank line
+    (per line with skip_blank=False, so validators see and count blank lines).
+    Shares the stream()/stream_batches() interface of DatasetStreamer.
+
+    With a byte range [start, end) only the lines that *begin* inside the
+    range are read, so adjacent ranges split a file without gaps or overlap.
+    """
+
+    def __init__(self, filepath: str, batch_size: int = 1024,
+                 start: int = 0, end: Optional[int] = None, skip_blank: bool = True):
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.start = start
+        self.end = end
+        self.skip_blank = skip_blank
+
+    def stream(self) -> Iterator[Row]:
+        for batch in self.stream_batches():
+            yield from batch
+
+    def _lines(self, f) -> Iterator[bytes]:
+        if self.start > 0:
+            # Unless the range begins right after a newline, the first
+            # (partial) line belongs to the previous range
+            f.seek(self.start - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+        if self.end is None:
+            yield from f
+            return
+        while f.tell() < self.end:
+            line = f.readline()
+            if not line:
+                return
+            yield line
+
+    def stream_batches(self) -> Iterator[Batch]:
+        source = os.path.basename(self.filepath)
+        batch: Batch = []
+        with open(self.filepath, mode="rb") as f:
+            for line in self._lines(f):
+                content = line.decode("utf-8").strip()
+                if not content and self.skip_blank:
+                    continue
+                batch.append({"text": content, "source": source})
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
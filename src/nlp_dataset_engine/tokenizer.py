@@ -0,0 +1,72 @@
+import os
+from typing import List, Optional
+from .sketches import hash64
+
+class ByteTokenizer:
+    """
+    Tokenizer-free baseline: one token per UTF-8 byte, plus an EOS token (256).
+    """
+    def __init__(self):
+        self.vocab_size = 257
+        self.eos_id = 256
+
+    def encode(self, text: str) -> List[int]:
+        return list(text.encode("utf-8"))
+
+
+class WhitespaceTokenizer:
+    """
+    Splits on whitespace and hashes each word into a fixed vocabulary.
+    Needs no vocabulary file; the last id is reserved for EOS.
+    """
+    def __init__(self, vocab_size: int = 65536):
+        self.vocab_size = vocab_size
+        self.eos_id = vocab_size - 1
+
+    def encode(self, text: str) -> List[int]:
+        buckets = self.vocab_size - 1
+        return [hash64(word) % buckets for word in text.split()]
+
+
+class HFTokenizer:
+    """
+    Wraps a HuggingFace `tokenizers` tokenizer.json file (optional dependency).
+    """
+    EOS_CANDIDATES = ("<|endoftext|>", "</s>", "<eos>", "[SEP]")
+
+    def __init__(self, path: str, eos_token: Optional[str] = None):
+        try:
+            from tokenizers import Tokenizer
+        except ImportError:
+            raise ImportError("Tokenizer files require the 'tokenizers' package: pip install tokenizers")
+
+        self.path = path
+        self.tokenizer = Tokenizer.from_file(path)
+        self.vocab_size = self.tokenizer.get_vocab_size()
+
+        candidates = [eos_token] if eos_token else self.EOS_CANDIDATES
+        for token in candidates:
+            token_id = self.tokenizer.token_to_id(token)
+            if token_id is not None:
+                self.eos_id = token_id
+                break
+        else:
+            raise ValueError(f"No EOS token found in {path}; tried {list(candidates)}")
+
+    def encode(self, text: str) -> List[int]:
+        return self.tokenizer.encode(text, add_special_tokens=False).ids
+
+
+def load_tokenizer(spec: str):
+    """
+    Builds a tokenizer from a spec string: 'byte', 'whitespace' or a path
+    to a HuggingFace tokenizer.json. Specs (not objects) are what get sent
+    to worker processes.
+    """
+    if spec == "byte":
+        return ByteTokenizer()
+    if spec == "whitespace":
+        return WhitespaceTokenizer()
+    if os.path.isfile(spec):
+        return HFTokenizer(spec)
+    raise ValueError(f"Unknown tokenizer '{spec}'. Use 'byte', 'whitespace' or a tokenizer.json path.")
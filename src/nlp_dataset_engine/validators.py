@@ -1,5 +1,15 @@
 from typing import Dict, Any
-from langdetect import detect, LangDetectException
+
+def _is_english(text: str) -> bool:
+    # langdetect is slow to import (it loads its language profiles),
+    # so only pay for it when the English check actually runs
+    from langdetect import detect, LangDetectException
+    try:
+        return detect(text) == 'en'
+    except LangDetectException:
+        # If langdetect can't figure it out (e.g. "123"), decide to drop or keep.
+        # Usually dropping is safer for NLP.
+        return False
 
 class DataValidator:
     """
@@ -39,13 +49,7 @@ class DataValidator:
            return False
  
         # Check 4: Language (only if enabled)
-        if self.check_english:
-            try:
-                if detect(text) != 'en':
-                    return False
-            except LangDetectException:
-                # If langdetect can't figure it out (e.g. "123"), decide to drop or keep.
-                # Usually dropping is safer for NLP.
-                return False
+        if self.check_english and not _is_english(text):
+            return False
             
         return True
\ No newline at end of file
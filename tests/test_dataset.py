@@ -0,0 +1,100 @@
+import pytest
+import csv
+import json
+from nlp_dataset_engine.dataset import Dataset
+from nlp_dataset_engine.loader import DatasetLoader
+from nlp_dataset_engine.validators import DataValidator
+from nlp_dataset_engine.checkpoint import CheckpointManager
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """
+    /data
+      - a.csv   (4 rows, one duplicate, one too short)
+      /nested
+        - b.txt (3 lines, one blank)
+    """
+    root = tmp_path / "data"
+    nested = root / "nested"
+    nested.mkdir(parents=True)
+
+    with open(root / "a.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "text"])
+        writer.writerow(["1", "The first valid sentence"])
+        writer.writerow(["2", "The first valid sentence"])
+        writer.writerow(["3", "Short"])
+        writer.writerow(["4", "Another valid sentence here"])
+
+    (nested / "b.txt").write_text("A line from a text file\n\nSecond line of the text file\n", encoding="utf-8")
+    return root
+
+def test_plan_is_lazy(data_dir):
+    calls = []
+    dataset = Dataset.from_path(str(data_dir)).map(lambda row: calls.append(row) or row)
+    assert calls == []
+
+    rows = list(dataset)
+    assert len(rows) == 6
+    assert len(calls) == 6
+
+def test_chained_pipeline(data_dir):
+    dataset = (Dataset.from_path(str(data_dir), batch_size=2)
+               .validate(DataValidator(min_length=10, check_english=False))
+               .dedup()
+               .map(lambda row: {"text": row["text"].upper()})
+               .filter(lambda row: "TEXT" not in row["text"]))
+
+    texts = sorted(row["text"] for row in dataset)
+    assert texts == ["ANOTHER VALID SENTENCE HERE", "THE FIRST VALID SENTENCE"]
+
+    report = dataset.stats.get_report()
+    assert report["total_processed"] == 6
+    assert report["dropped_rows"] == 1
+
+def test_limit_stops_reading(data_dir):
+    validated = Dataset.from_files([str(data_dir / "a.csv")]).validate(
+        DataValidator(min_length=10, check_english=False)
+    )
+    limited = validated.limit(1)
+    assert len(list(limited)) == 1
+    # Reading stopped right after the first valid row
+    assert limited.stats.total_processed == 1
+    # The parent plan is untouched and has not run
+    assert validated.stats is None
+
+def test_write_shards_with_checkpoint(data_dir, tmp_path):
+    checkpoint = CheckpointManager(str(tmp_path / "ckpt.txt"))
+    dataset = Dataset.from_path(str(data_dir)).validate(DataValidator(min_length=10, check_english=False))
+
+    stats = dataset.write_shards(str(tmp_path / "out" / "clean"), shard_size=2, checkpoint=checkpoint)
+    assert stats.valid_count == 5
+
+    shards = sorted((tmp_path / "out").glob("clean-*.jsonl"))
+    assert [len(p.read_text().splitlines()) for p in shards] == [2, 2, 1]
+    assert checkpoint.is_done(str(data_dir / "a.csv"))
+
+    # Second run skips everything already done
+    again = dataset.write_shards(str(tmp_path / "out2" / "clean"), checkpoint=checkpoint)
+    assert again.valid_count == 0
+
+def test_loader_runs_on_engine(data_dir, tmp_path):
+    loader = DatasetLoader(str(data_dir), min_length=10)
+    output = tmp_path / "loader.jsonl"
+    stats = loader.export_to_jsonl(str(output))
+
+    # Only the recursive .txt file is loaded; its blank line counts as dropped
+    assert stats == {"total_processed": 3, "dropped_too_short": 1, "valid_yielded": 2}
+    first = json.loads(output.read_text().splitlines()[0])
+    assert first == {"text": "A line from a text file", "source": "b.txt"}
+
+def test_loader_reads_single_file_as_lines(data_dir):
+    """A single file is read line by line, even a CSV without a text column"""
+    loader = DatasetLoader(str(data_dir / "a.csv"), min_length=10)
+    texts = [row["text"] for row in loader.stream_data()]
+
+    # Raw lines, not parsed CSV fields (which rows pass depends on langdetect)
+    assert texts and all(t[0].isdigit() and "," in t for t in texts)
+    assert "3,Short" not in texts
+    assert loader.stats["total_processed"] == 5
+    assert loader.stats["dropped_too_short"] + loader.stats["valid_yielded"] == 5
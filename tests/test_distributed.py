@@ -0,0 +1,151 @@
+import pytest
+import json
+import os
+import time
+from nlp_dataset_engine.distributed import (
+    WorkQueue, DistributedWorker, LeaseLost, plan_units, reduce_queue
+)
+from nlp_dataset_engine.streamer import TextStreamer
+from nlp_dataset_engine.validators import DataValidator
+
+CONFIG = {
+    "col": "text", "english": False, "shard_size": 100, "sample": 1.0, "compress": False,
+    "profile": True, "csv_backend": "stdlib", "original_row": True
+}
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "raw"
+    root.mkdir()
+    (root / "big.txt").write_text("\n".join(f"Line number {i} of the corpus" for i in range(500)), encoding="utf-8")
+    (root / "small.txt").write_text("Only one line in this file\n", encoding="utf-8")
+    return root
+
+def make_queue(tmp_path, corpus, lease_seconds=300):
+    queue = WorkQueue(str(tmp_path / "queue"), lease_seconds=lease_seconds)
+    queue.write_config(dict(CONFIG, output=str(tmp_path / "out" / "clean")))
+    queue.enqueue(plan_units(str(corpus), split_bytes=2048))
+    return queue
+
+def test_byte_ranges_cover_file_exactly(corpus):
+    path = str(corpus / "big.txt")
+    units = [u for u in plan_units(path, split_bytes=1000)]
+    assert len(units) > 5
+
+    texts = []
+    for unit in units:
+        texts.extend(row["text"] for row in TextStreamer(path, start=unit["start"], end=unit["end"]).stream())
+    assert texts == [row["text"] for row in TextStreamer(path).stream()]
+
+def test_enqueue_is_idempotent(tmp_path, corpus):
+    queue = make_queue(tmp_path, corpus)
+    total = queue.status()["pending"]
+    assert queue.enqueue(plan_units(str(corpus), split_bytes=2048)) == 0
+    assert queue.status()["pending"] == total
+
+def test_expired_lease_is_handed_over(tmp_path, corpus):
+    queue = make_queue(tmp_path, corpus, lease_seconds=0.2)
+    dead = queue.lease("dead-worker")
+    time.sleep(0.3)
+
+    # The surviving worker drains everything, including the dead worker's unit
+    total = queue.status()["pending"] + 1
+    worker = DistributedWorker(queue, worker_id="alive", poll_seconds=0.01)
+    assert worker.run() == total
+    assert queue.status() == {"pending": 0, "leased": 0, "done": total}
+
+    with pytest.raises(LeaseLost):
+        queue.heartbeat(dead)
+    # A late result from the dead worker is rejected
+    assert queue.complete(dead, {"unit": dead.unit}) is False
+
+def test_lease_renewed_while_every_row_is_rejected(tmp_path, monkeypatch):
+    root = tmp_path / "raw"
+    root.mkdir()
+    (root / "noise.txt").write_text("\n".join("x" for _ in range(4000)), encoding="utf-8")
+    queue = WorkQueue(str(tmp_path / "queue"), lease_seconds=0.3)
+    queue.write_config(dict(CONFIG, output=str(tmp_path / "out" / "clean")))
+    queue.enqueue(plan_units(str(root)))
+
+    # Slow validation (like langdetect), while another host keeps polling for expired leases
+    validate = DataValidator.validate
+    calls = {"n": 0}
+    def slow_validate(self, item):
+        calls["n"] += 1
+        if calls["n"] % 200 == 0:
+            time.sleep(0.02)
+            queue.requeue_expired()
+        return validate(self, item)
+    monkeypatch.setattr(DataValidator, "validate", slow_validate)
+
+    lease = queue.lease("slow")
+    assert DistributedWorker(queue, worker_id="slow").process(lease)
+    assert queue.status() == {"pending": 0, "leased": 0, "done": 1}
+
+    result = json.loads(open(next(queue.result_paths())).read())
+    assert result["stats"]["valid_count"] == 0
+    assert result["stats"]["dropped_count"] == 4000
+
+def test_lease_lost_mid_unit_is_abandoned(tmp_path, monkeypatch):
+    root = tmp_path / "raw"
+    root.mkdir()
+    (root / "long.txt").write_text("\n".join(f"Line number {i} of a long unit" for i in range(5000)), encoding="utf-8")
+    queue = WorkQueue(str(tmp_path / "queue"), lease_seconds=0.3)
+    queue.write_config(dict(CONFIG, output=str(tmp_path / "out" / "clean")))
+    queue.enqueue(plan_units(str(root)))
+    lease = queue.lease("stalled")
+
+    # Mid-unit, the worker stalls long enough for another host to requeue its lease
+    validate = DataValidator.validate
+    calls = {"n": 0}
+    def stalling_validate(self, item):
+        calls["n"] += 1
+        if calls["n"] == 1500:
+            time.sleep(0.15)
+            os.utime(lease.path, (0, 0))
+            queue.requeue_expired()
+        return validate(self, item)
+    monkeypatch.setattr(DataValidator, "validate", stalling_validate)
+
+    # The lost lease ends the unit: no partial result is recorded
+    assert DistributedWorker(queue, worker_id="stalled").process(lease) is False
+    assert calls["n"] < 5000
+    assert queue.status() == {"pending": 1, "leased": 0, "done": 0}
+
+def test_workers_and_reduce(tmp_path, corpus):
+    queue = make_queue(tmp_path, corpus)
+    units = queue.status()["pending"]
+
+    # A worker that dies mid-unit leaves a partial shard behind
+    orphan = tmp_path / "out" / "clean-unit-0000000000000000-dead-0000.jsonl"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_text("{}\n")
+
+    # Two workers sharing the queue (run one after another here)
+    first = DistributedWorker(queue, worker_id="w1")
+    lease = queue.lease("w1")
+    assert first.process(lease)
+    completed = 1 + DistributedWorker(queue, worker_id="w2").run()
+    assert completed == units
+
+    stats = reduce_queue(queue)
+    assert stats.valid_count == 501
+    # big.txt is split into several units but counts as one file
+    assert units > 2
+    assert stats.files_processed == 2
+    assert not orphan.exists()
+
+    manifest = json.loads((tmp_path / "out" / "manifest.json").read_text())
+    assert manifest["total_records"] == 501
+    listed = [f["filename"] for f in manifest["files"]]
+    assert sorted(listed) == sorted(p for p in os.listdir(tmp_path / "out") if p.startswith("clean-unit-"))
+    assert {"w1", "w2"} == {name.split("-")[3] for name in listed}
+
+    rows = sum(len((tmp_path / "out" / name).read_text().splitlines()) for name in listed)
+    assert rows == 501
+    assert json.loads((tmp_path / "out" / "profile.json").read_text())["rows"] == 501
+
+def test_reduce_refuses_unfinished_queue(tmp_path, corpus):
+    queue = make_queue(tmp_path, corpus)
+    with pytest.raises(RuntimeError, match="pending"):
+        reduce_queue(queue)
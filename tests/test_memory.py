@@ -0,0 +1,110 @@
+import pytest
+from nlp_dataset_engine.memory import SpillableSet, MemoryMonitor, parse_size
+from nlp_dataset_engine.checkpoint import CheckpointManager
+from nlp_dataset_engine.dataset import Dataset
+
+def test_parse_size():
+    assert parse_size("512") == 512
+    assert parse_size("512M") == 512 * 1024 ** 2
+    assert parse_size("1.5gb") == int(1.5 * 1024 ** 3)
+
+def test_spillable_set_moves_to_disk():
+    keys = SpillableSet(max_items=100)
+    for i in range(250):
+        keys.add(f"key-{i}")
+
+    # Only the tail since the last spill is held in memory
+    assert len(keys._memory) == 50
+    assert len(keys) == 250
+    assert "key-0" in keys
+    assert "key-249" in keys
+    assert "missing" not in keys
+
+    keys.add("key-0")  # Already spilled: no duplicate
+    keys.spill()
+    assert len(keys) == 250
+    keys.close()
+
+def test_checkpoint_with_bounded_index(tmp_path):
+    ckpt = str(tmp_path / "ckpt.txt")
+    checkpoint = CheckpointManager(ckpt, max_items=3)
+    for i in range(10):
+        checkpoint.mark_done(f"/data/file{i}.csv")
+
+    reloaded = CheckpointManager(ckpt, max_items=3)
+    assert all(reloaded.is_done(f"/data/file{i}.csv") for i in range(10))
+    assert not reloaded.is_done("/data/other.csv")
+    assert len(reloaded.processed_files._memory) < 3
+
+def test_over_budget_spills_dedup(tmp_path):
+    """A budget of 1 byte forces every stateful component to spill, without changing output"""
+    data = tmp_path / "data.txt"
+    data.write_text("\n".join(f"line {i % 300}" for i in range(1000)), encoding="utf-8")
+
+    monitor = MemoryMonitor(max_bytes=1)
+    rows = []
+
+    class Collect:
+        def write_batch(self, batch):
+            rows.extend(batch)
+
+    Dataset.from_files([str(data)], batch_size=64).dedup().write(Collect(), monitor=monitor)
+
+    assert len(rows) == 300
+    report = monitor.get_report()
+    assert report["spill_events"] > 0
+    assert "dedup" in report["component_peak_mb"]
+
+def test_backoff_waits_for_growth():
+    """Usage stuck over budget (RSS rarely shrinks) must not spill on every check"""
+    class Component:
+        def __init__(self, size):
+            self.size = size
+            self.spills = 0
+
+        def memory_usage(self):
+            return self.size
+
+        def spill(self):
+            self.spills += 1
+            self.size = 0
+
+    class FixedMonitor(MemoryMonitor):
+        used = 150
+
+        def usage(self):
+            return self.used
+
+    monitor = FixedMonitor(max_bytes=100, regrow_bytes=50)
+    big, small = Component(80), Component(30)
+    monitor.register("big", big)
+    monitor.register("small", small)
+
+    for _ in range(10):
+        monitor.check()
+    # The biggest component alone covers the 50-byte overshoot
+    assert (big.spills, small.spills) == (1, 0)
+
+    big.size = 80
+    monitor.used = 210
+    monitor.check()
+    assert (big.spills, small.spills) == (2, 1)
+    assert monitor.spill_events == 3
+
+def test_no_tracemalloc_without_budget(monkeypatch):
+    """Hosts without RSS only pay for tracemalloc when a budget needs it"""
+    import tracemalloc
+    from nlp_dataset_engine import memory
+    monkeypatch.setattr(memory, "current_rss", lambda: None)
+
+    monitor = MemoryMonitor()
+    assert not monitor.trace
+    assert monitor.check() is None
+    assert monitor.get_report()["source"] == "unavailable"
+    assert monitor.get_report()["peak_mb"] is None
+
+    was_tracing = tracemalloc.is_tracing()
+    budgeted = MemoryMonitor(max_bytes=1 << 30)
+    assert budgeted.trace and budgeted.get_report()["source"] == "tracemalloc"
+    if not was_tracing:
+        tracemalloc.stop()
@@ -0,0 +1,68 @@
+import pytest
+import json
+from nlp_dataset_engine.packer import PackedSequenceWriter, PackedSequenceReader
+from nlp_dataset_engine.tokenizer import WhitespaceTokenizer, load_tokenizer
+from nlp_dataset_engine.manifest import ManifestGenerator
+
+ROWS = [{"text": f"document number {i} with some words"} for i in range(50)]
+
+def write_packed(prefix, workers, **kwargs):
+    packer = PackedSequenceWriter(prefix, workers=workers, **kwargs)
+    for start in range(0, len(ROWS), 7):
+        packer.write_batch(ROWS[start:start + 7])
+    packer.close()
+    return packer
+
+def test_byte_packing_round_trip(tmp_path):
+    prefix = str(tmp_path / "clean")
+    packer = write_packed(prefix, workers=0, seq_len=64, sequences_per_shard=10)
+
+    reader = PackedSequenceReader(packer.index_path)
+    index = reader.index
+    assert index["dtype"] == "uint16"
+    assert len(index["shards"]) > 1
+    assert all(len(reader[i]) == 64 for i in range(len(reader)))
+
+    # Concatenated sequences = EOS-separated documents, then EOS padding
+    stream = [token for i in range(len(reader)) for token in reader[i]]
+    expected = []
+    for row in ROWS:
+        expected.extend(row["text"].encode("utf-8"))
+        expected.append(256)
+    assert stream[:len(expected)] == expected
+    assert set(stream[len(expected):]) <= {256}
+    assert index["total_tokens"] == len(expected)
+
+    files = list(reader._files)
+    reader.close()
+    assert len(files) == len(index["shards"]) and all(f.closed for f in files)
+
+def test_worker_pool_matches_inline(tmp_path):
+    inline = write_packed(str(tmp_path / "a"), workers=0, tokenizer="whitespace", seq_len=16)
+    pooled = write_packed(str(tmp_path / "b"), workers=2, tokenizer="whitespace", seq_len=16)
+
+    with PackedSequenceReader(inline.index_path) as a, PackedSequenceReader(pooled.index_path) as b:
+        assert len(a) == len(b) > 0
+        assert all(a[i].tolist() == b[i].tolist() for i in range(len(a)))
+
+def test_whitespace_tokenizer_is_stable():
+    tokenizer = WhitespaceTokenizer(vocab_size=1000)
+    ids = tokenizer.encode("hello world hello")
+    assert ids[0] == ids[2] != ids[1]
+    assert all(i < tokenizer.eos_id for i in ids)
+
+    with pytest.raises(ValueError):
+        load_tokenizer("not-a-tokenizer")
+
+def test_manifest_references_token_shards(tmp_path):
+    prefix = str(tmp_path / "clean")
+    (tmp_path / "clean-0000.jsonl").write_text("{}\n")
+    packer = write_packed(prefix, workers=0, seq_len=32)
+
+    ManifestGenerator(prefix).generate(len(ROWS), token_index=packer.index_path)
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+
+    assert manifest["total_files"] == 1
+    token_shards = manifest["token_shards"]
+    assert token_shards["index"] == "clean-tokens.idx.json"
+    assert [f["filename"] for f in token_shards["files"]] == ["clean-tokens-0000.bin"]
@@ -0,0 +1,77 @@
+import pytest
+import json
+from nlp_dataset_engine.sketches import HyperLogLog, TopK, LengthHistogram
+from nlp_dataset_engine.stats import DatasetStats
+from nlp_dataset_engine.profiler import DatasetProfile
+
+def test_hyperloglog_estimate_and_merge():
+    a = HyperLogLog(precision=12)
+    b = HyperLogLog(precision=12)
+    for i in range(20000):
+        a.add(f"doc-{i}")
+    for i in range(10000, 30000):
+        b.add(f"doc-{i}")
+
+    assert abs(a.count() - 20000) / 20000 < 0.05
+
+    # Union of the two sketches ~ 30k distinct values
+    a.merge(b)
+    assert abs(a.count() - 30000) / 30000 < 0.05
+
+def test_topk_finds_heavy_hitters():
+    top = TopK(k=3)
+    for token, count in [("the", 500), ("data", 300), ("engine", 200)]:
+        for _ in range(count):
+            top.add(token)
+    for i in range(1000):
+        top.add(f"rare-{i}")
+
+    assert [token for token, _ in top.top()] == ["the", "data", "engine"]
+
+def test_histogram_quantiles():
+    hist = LengthHistogram()
+    for value in range(1, 1001):
+        hist.add(value)
+
+    summary = hist.summary()
+    assert summary["min"] == 1
+    assert summary["max"] == 1000
+    assert abs(summary["p50"] - 500) / 500 < 0.1
+    assert abs(summary["p90"] - 900) / 900 < 0.1
+
+def test_stats_profile_merge_and_save(tmp_path):
+    """Two workers' stats merge into one profile, written as profile.json"""
+    worker_a = DatasetStats(profile=True)
+    worker_b = DatasetStats(profile=True)
+
+    worker_a.update(True, {"text": "hello world again"}, source="a.csv")
+    worker_a.update(False, {"text": "bad"}, source="a.csv")
+    worker_b.update(True, {"text": "hello there"}, source="b.csv")
+
+    # Round-trip through the serialized form, as a remote worker would
+    merged = DatasetStats.from_state(json.loads(json.dumps(worker_a.to_state())))
+    merged.merge(worker_b)
+
+    assert merged.get_report()["valid_rows"] == 2
+    assert merged.get_report()["dropped_rows"] == 1
+
+    report = merged.profile.get_report()
+    assert report["rows"] == 2
+    assert report["approx_vocabulary_size"] == 4
+    assert report["top_tokens"][0] == {"token": "hello", "count": 2}
+
+    path = merged.profile.save(str(tmp_path))
+    with open(path) as f:
+        assert json.load(f)["token_length"]["max"] == 3
+
+def test_profile_counts_repeated_tokens_across_flushes():
+    """Token counts are pre-aggregated per block of rows; totals stay exact"""
+    profile = DatasetProfile()
+    rows = DatasetProfile.FLUSH_ROWS * 2 + 10
+    for _ in range(rows):
+        profile.add("The the THE engine", source="a.txt")
+
+    report = profile.get_report()
+    assert report["top_tokens"][:2] == [{"token": "the", "count": 3 * rows}, {"token": "engine", "count": rows}]
+    assert report["top_sources"] == [{"source": "a.txt", "count": rows}]
+    assert report["approx_vocabulary_size"] == 2
@@ -0,0 +1,46 @@
+import pytest
+import json
+import subprocess
+import sys
+
+# Modules that must only load when the feature using them runs
+HEAVY_MODULES = ["langdetect", "gzip", "sqlite3", "multiprocessing", "tracemalloc", "pyarrow", "polars", "tokenizers"]
+
+# Generous ceiling for importing the CLI (currently ~20ms); catches regressions
+# like an eager langdetect import without being flaky on slow CI runners
+IMPORT_BUDGET_SECONDS = 0.25
+
+def run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout
+
+def loaded_heavy_modules(code: str):
+    check = f"import sys, json\n{code}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    return json.loads(run_python(check).strip().splitlines()[-1])
+
+def test_cli_import_is_lightweight():
+    assert loaded_heavy_modules("import nlp_dataset_engine.cli") == []
+
+def test_no_english_pipeline_skips_langdetect():
+    code = (
+        "from nlp_dataset_engine.dataset import Dataset\n"
+        "from nlp_dataset_engine.validators import DataValidator\n"
+        "DataValidator(check_english=False).validate({'text': 'hello there world'})"
+    )
+    assert loaded_heavy_modules(code) == []
+
+def test_cli_import_time():
+    """Best of 3 cold imports, measured with -X importtime (microseconds)"""
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import nlp_dataset_engine.cli"],
+            capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == "nlp_dataset_engine.cli":
+                timings.append(int(parts[1]) / 1e6)
+
+    assert timings
+    assert min(timings) < IMPORT_BUDGET_SECONDS
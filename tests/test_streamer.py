@@ -2,7 +2,7 @@ import pytest
 import csv
 import json
 import os
-from nlp_dataset_engine.streamer import DatasetStreamer
+from nlp_dataset_engine.streamer import DatasetStreamer, ArrowBackend
 from nlp_dataset_engine.validators import DataValidator
 from nlp_dataset_engine.jsonl_writer import JSONLWriter
 from nlp_dataset_engine.validators import DataValidator
@@ -77,4 +77,106 @@ def test_noise_filter():
     
     # CASE 3: Edge case
     # "a #$%^&*" -> 8 chars, 1 alpha. 1/8 = 0.125 alpha ratio (Fail)
-    assert validator.validate({"text": "a #$%^&*"}) is False
\ No newline at end of file
+    assert validator.validate({"text": "a #$%^&*"}) is False
+
+
+@pytest.fixture
+def tricky_csv(tmp_path):
+    """BOM, blank line, quoted newline and whitespace-only text"""
+    file_path = tmp_path / "tricky.csv"
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "text"])
+        writer.writerow(["1", "  Hello, \"world\"  "])
+        f.write("\n")
+        writer.writerow(["2", "multi\nline text"])
+        writer.writerow(["3", "   "])
+    return str(file_path)
+
+@pytest.fixture
+def ragged_csv(tmp_path):
+    """Rows with missing and extra fields, after enough clean rows to span several batches"""
+    file_path = tmp_path / "ragged.csv"
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["text", "id"])
+        for i in range(3000):
+            writer.writerow([f"row {i}", str(i)])
+        writer.writerow(["short row"])
+        writer.writerow(["long row", "1", "extra", "fields"])
+        writer.writerow(["back to normal", "2"])
+    return str(file_path)
+
+@pytest.fixture
+def duplicate_header_csv(tmp_path):
+    file_path = tmp_path / "duplicate.csv"
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["text", "id", "text"])
+        writer.writerow(["first column", "1", "last column"])
+        writer.writerow(["only first", "2", ""])
+    return str(file_path)
+
+@pytest.fixture
+def short_row_csv(tmp_path):
+    """A short row (missing fields are None in DictReader) next to an empty last field"""
+    file_path = tmp_path / "short.csv"
+    file_path.write_bytes(b"a,text,b\nx,short row\nq,empty last field,\n")
+    return str(file_path)
+
+@pytest.fixture
+def crlf_csv(tmp_path):
+    """Windows export: CRLF line endings and a CRLF inside a quoted field"""
+    file_path = tmp_path / "crlf.csv"
+    file_path.write_bytes(b'id,text\r\n1,"two\r\nlines"\r\n2,plain\r\n')
+    return str(file_path)
+
+@pytest.fixture
+def cr_only_csv(tmp_path):
+    """Old Mac line endings and a space after a closing quote; DictReader accepts both"""
+    file_path = tmp_path / "cr.csv"
+    file_path.write_bytes(b'text,id\r"quoted" ,1\rplain text,2\r')
+    return str(file_path)
+
+def legacy_stream(path, column="text"):
+    """The original DictReader implementation, used as the reference semantics"""
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            content = row.get(column, "").strip()
+            if content:
+                yield {"text": content, "original_row": str(row)}
+
+@pytest.mark.parametrize("fixture", ["tricky_csv", "ragged_csv", "duplicate_header_csv",
+                                     "short_row_csv", "crlf_csv", "cr_only_csv"])
+@pytest.mark.parametrize("backend", ["stdlib", "arrow", "polars"])
+def test_backends_match_dictreader(request, fixture, backend):
+    """Every backend yields exactly what csv.DictReader did"""
+    if backend == "arrow":
+        pytest.importorskip("pyarrow")
+        # Small blocks, so ragged rows show up after some batches were already yielded
+        backend = ArrowBackend()
+        backend.block_size = 4096
+    if backend == "polars":
+        pytest.importorskip("polars")
+
+    path = request.getfixturevalue(fixture)
+    expected = list(legacy_stream(path))
+    assert list(DatasetStreamer(path, backend=backend, batch_size=100).stream()) == expected
+
+    projected = list(DatasetStreamer(path, backend=backend, keep_original_row=False).stream())
+    assert projected == [{"text": row["text"]} for row in expected]
+
+@pytest.mark.parametrize("backend", ["stdlib", "arrow", "polars"])
+def test_backends_missing_column(sample_csv, backend):
+    if backend == "arrow":
+        pytest.importorskip("pyarrow")
+    if backend == "polars":
+        pytest.importorskip("polars")
+
+    streamer = DatasetStreamer(sample_csv, text_column="body", backend=backend)
+    with pytest.raises(ValueError, match="Column 'body' not found"):
+        list(streamer.stream())
+
+def test_stream_batches_size(sample_csv):
+    streamer = DatasetStreamer(sample_csv, batch_size=1)
+    assert [len(batch) for batch in streamer.stream_batches()] == [1, 1]